@@ -1,5 +1,3 @@
-import random
-
 from simulation import LübeckACTR
 
 class BeedrillAdapter:
@@ -16,7 +14,7 @@ class BeedrillAdapter:
             agent_construct: nothing at the moment
         """
         self.agent_construct = agent_construct
-        self.move_time = random.uniform(3.0, 10.0)
+        self.move_time = None  # drawn from the agents rng on the first step
 
     # Extending ACT-R
     def extending_actr(self):
@@ -43,5 +41,7 @@ class BeedrillAdapter:
             print("SUCCESS!")
 
         self.agent_construct.actr_time = self.agent_construct.actr_time + other_agent.actr_time
+        if self.move_time is None:
+            self.move_time = self.agent_construct.rng.uniform(3.0, 10.0)
         if other_agent.actr_time > self.move_time:
             self.agent_construct.middleman.motor_input("W", self.agent_construct)
\ No newline at end of file
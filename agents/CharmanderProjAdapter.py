@@ -5,7 +5,6 @@ from pyactr.buffers import Buffer as PyactrBuffer
 from simulation import LübeckACTR
 from simulation.AgentConstruct import AgentConstruct
 
-import random
 import pandas as pd
 from enum import Enum
 
@@ -91,7 +90,7 @@ class CharmanderAdapter:
                     for slot in chunk:
                         landmark_location[slot[0]] = slot[1]
                     landmarks.append(landmark_location)
-            selected_landmark = random.choice(landmarks)
+            selected_landmark = self.agent_construct.rng.choice(landmarks)
             LübeckACTR.set_imaginal(self.agent_construct.actr_agent, 
                                     AdvChunk(isa='target_landmark',
                                              landmark_field=FieldChunk(x=selected_landmark['x'], y=selected_landmark['y'])), 
@@ -1,5 +1,4 @@
 import heapq
-import random
 
 import numpy as np
 import pyactr as actr
@@ -122,7 +121,7 @@ class ChatotAdapter:
                     prev_x != int(str(d.x)) or prev_y != int(str(d.y))
                 ):
                     usable_decmem.append(d)
-            landmark = random.choice(usable_decmem)
+            landmark = self.agent_construct.rng.choice(usable_decmem)
             goal.x = landmark.x
             goal.y = landmark.y
             self.log("cyan", f"Chosen landmark at {goal.x}, {goal.y}!")
@@ -370,7 +369,7 @@ class ChatotAdapter:
             if len(agents) == 0:
                 imaginal.akey = None
             else:
-                key, x, y = random.choice(agents)
+                key, x, y = self.agent_construct.rng.choice(agents)
                 imaginal.akey = key
                 imaginal.ax = x
                 imaginal.ay = y
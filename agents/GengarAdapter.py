@@ -1,4 +1,4 @@
-import heapq, random
+import heapq
 from typing import Dict, List, Tuple, Optional, Union
 
 import pyactr as actr
@@ -147,7 +147,7 @@ class GengarAdapter:
         lm_chunks = [c for c in ag.decmem if c.typename == "landmark"]
         if not lm_chunks:
             return
-        lm = random.choice(lm_chunks)
+        lm = self.agent_construct.rng.choice(lm_chunks)
         self.current_plan = dict(goalname=lm.name,
                                  goalx=int(str(lm.x)),
                                  goaly=int(str(lm.y)),
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from PIL import Image, ImageTk, ImageSequence
+
+
+class AssetCache:
+    """
+    LRU-Cache für skalierte Sprites, geteilt von allen GUI-Instanzen eines Tk-Interpreters.
+    Jede Datei wird nur einmal dekodiert (GIFs mit allen Frames), jede Größe nur einmal skaliert.
+
+    Attributes:
+        max_entries (int): Maximale Anzahl skalierter Einträge, danach fliegt der am längsten unbenutzte raus
+        images (OrderedDict): (Pfad, Größe, Modus) -> PhotoImage bzw. Liste von PhotoImages bei GIFs
+        sources (dict): Pfad -> dekodiertes PIL-Image bzw. Liste der GIF-Frames
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.images = OrderedDict()
+        self.sources = {}
+
+    def scaled(self, path, size, master=None):
+        """Exakt auf size × size skaliert (Umgebung, Locations)."""
+        return self._get(path, int(size), "scaled", master)
+
+    def thumbnail(self, path, size, master=None):
+        """Passt in size × size, behält das Seitenverhältnis und vergrößert nie (wie PIL thumbnail)."""
+        return self._get(path, int(size), "thumbnail", master)
+
+    def gif_frames(self, path, size, master=None):
+        """Alle Frames eines GIFs, mit Seitenverhältnis auf size × size skaliert."""
+        return self._get(path, int(size), "gif", master)
+
+    def clear(self):
+        self.images.clear()
+        self.sources.clear()
+
+    def _get(self, path, size, mode, master):
+        key = (path, size, mode)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        image = self._render(path, size, mode, master)
+        self.images[key] = image
+        if len(self.images) > self.max_entries:
+            self.images.popitem(last=False)
+        return image
+
+    def _source(self, path, mode):
+        source_key = (path, mode == "gif")
+        source = self.sources.get(source_key)
+        if source is None:
+            image = Image.open(path)
+            if mode == "gif":
+                source = [frame.copy() for frame in ImageSequence.Iterator(image)]
+            else:
+                image.load()
+                source = image
+            self.sources[source_key] = source
+        return source
+
+    def _render(self, path, size, mode, master):
+        source = self._source(path, mode)
+        if mode == "scaled":
+            return ImageTk.PhotoImage(source.resize((size, size), Image.LANCZOS), master=master)
+        if mode == "thumbnail":
+            image = source.copy()
+            image.thumbnail((size, size), Image.LANCZOS)
+            return ImageTk.PhotoImage(image, master=master)
+        return [
+            ImageTk.PhotoImage(self.resize_keep_aspect(frame, size, size), master=master)
+            for frame in source
+        ]
+
+    @staticmethod
+    def resize_keep_aspect(image, max_width, max_height):
+        """
+        Skaliert ein PIL‐Image so, dass es innerhalb von (max_width × max_height)
+        bleibt, ohne das Seitenverhältnis zu verändern.
+        """
+        original_width, original_height = image.size
+        ratio = min(max_width / original_width, max_height / original_height)
+        new_w = int(original_width * ratio)
+        new_h = int(original_height * ratio)
+        return image.resize((new_w, new_h), Image.LANCZOS)
+
+
+# Gemeinsamer Cache aller MatrixWorldGUI-Instanzen
+asset_cache = AssetCache()
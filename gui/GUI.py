@@ -1,5 +1,4 @@
 import tkinter as tk
-from PIL import Image, ImageTk, ImageSequence
 import os
 import random
 from simulation.Food import Food
@@ -7,11 +6,17 @@ from simulation.Wall import Wall
 from simulation.Location import Location
 from simulation.Water import Water
 from simulation.AgentConstruct import AgentConstruct
+from gui.AssetCache import asset_cache
 
 class MatrixWorldGUI:
     def __init__(self, world, root):
         self.world = world
         self.root = root
+        # Gezeichnet wird nur aus WorldSnapshots, die Game veröffentlicht (siehe update)
+        self.snapshot, _ = world.snapshots.take()
+        self.fps = 20
+        # Eigener Generator, damit die GUI den Seed der Simulation nicht verbraucht
+        self.rng = random.Random()
         self.root.title("Social Simulation")
         self.root.configure(bg='black')
         self.root.state('zoomed')  # Maximiert das Fenster
@@ -78,19 +83,32 @@ class MatrixWorldGUI:
             font=("Helvetica", 14)
         )
         self.visual_stimuli_frame = tk.Frame(self.info_frame, bg='#171717')
+        # Persistentes Label‐Gitter der Visual Stimuli, wird nur bei neuer Sichtfeld‐Form neu aufgebaut
+        self.stimuli_labels = []  # Zeilen von tk.Label
+        self.stimuli_texts = []   # Zeilen der angezeigten Texte
 
         # Zellgröße berechnen
         canvas_width = screen_width - info_frame_width
-        grid_cols = len(self.world.level_matrix[0])
-        grid_rows = len(self.world.level_matrix)
+        grid_cols = len(self.snapshot.cells[0])
+        grid_rows = len(self.snapshot.cells)
         self.cell_size = min(canvas_width / grid_cols, screen_height / grid_rows) * self.zoom_factor
         self.image_height = int(self.cell_size * 2.5)
 
-        # Caches für bereits geladene Bilder/Animationen
+        # Caches für bereits geladene Bilder/Animationen. Dekodiert und skaliert wird im geteilten AssetCache,
+        # hier liegen nur die Bilder der aktuellen Zellgröße und werden nur bei Zoom/Resize verworfen.
+        self.assets = asset_cache
         self.agent_images = {}    # Gif‐Frame‐Index pro Datei
         self.agent_gifs = {}      # Liste der PhotoImage‐Frames pro GIF
         self.food_images = {}     # Skalierte Food‐Bilder pro Food‐Instanz
 
+        # Persistente Canvas‐Items: pro Zelle Terrain‐Art, Overlay, Food und Agenten
+        self.layout = None        # (Canvas‐Breite, Canvas‐Höhe, Zellgröße) des letzten draw_grid
+        self.cell_items = {}      # (Zeile, Spalte) → Items der veränderlichen Ebenen
+        self.agent_items = {}     # Canvas‐Item‐ID → GIF‐Pfad, für die Animation
+        self.dirty_cells = set()  # Zellen, die beim nächsten update() neu gezeichnet werden
+        self.selection_key = None # Auswahl und Position, für die das rote Overlay gezeichnet ist
+        self.selected_cell = None # (Zeile, Spalte) eines ausgewählten Nicht‐Agenten
+
         # Umgebungsbilder: Gras, Baum (Wall), Wasser
         self.environment_images = {
             "grass": self.load_environment_image("gui/sprites/environment/grass.png"),
@@ -110,7 +128,7 @@ class MatrixWorldGUI:
         #    einer der sechs Location‐Typen zuordnen.
         self.location_mapping = {}
         idx = 0
-        for row in self.world.level_matrix:
+        for row in self.snapshot.cells:
             for cell in row:
                 for obj in cell:
                     if isinstance(obj, Location) and obj not in self.location_mapping:
@@ -123,13 +141,13 @@ class MatrixWorldGUI:
 
         # 2) Einen zufälligen Agenten auswählen (falls vorhanden) und Info‐Panel initialisieren
         all_agents = [
-            agent for row in self.world.level_matrix
+            agent for row in self.snapshot.cells
             for cell in row
             for agent in cell
             if isinstance(agent, AgentConstruct)
         ]
         if all_agents:
-            self.selected_agent = random.choice(all_agents)
+            self.selected_agent = self.rng.choice(all_agents)
             self.update_info_panel(self.selected_agent)
         else:
             self.selected_agent = None
@@ -167,29 +185,13 @@ class MatrixWorldGUI:
         info_frame_width = new_width // 5
         canvas_width = new_width - info_frame_width
 
-        grid_cols = len(self.world.level_matrix[0])
-        grid_rows = len(self.world.level_matrix)
+        grid_cols = len(self.snapshot.cells[0])
+        grid_rows = len(self.snapshot.cells)
         new_cell_size = min(canvas_width / grid_cols, new_height / grid_rows) * self.zoom_factor
 
         if abs(new_cell_size - self.cell_size) > 1:
             self.cell_size = new_cell_size
-            self.image_height = int(self.cell_size * 2.5)
-
-            # Umgebungsbilder neu laden
-            self.environment_images["grass"] = self.load_environment_image("gui/sprites/environment/grass.png")
-            self.environment_images["tree"]  = self.load_environment_image("gui/sprites/environment/tree.png")
-            self.environment_images["water"] = self.load_environment_image("gui/sprites/environment/water.png")
-
-            # Location‐Bilder neu laden
-            for name in self.location_images:
-                path = f"gui/sprites/environment/{name}.png"
-                self.location_images[name] = self.load_environment_image(path)
-
-            # Food‐ und Agenten‐Caches leeren, damit sie neu skaliert werden
-            self.food_images.clear()
-            self.agent_gifs.clear()
-            self.agent_images.clear()
-            self.draw_grid()
+            self.rescale_images()
 
     def zoom_in(self):
         self.zoom_factor *= 1.1
@@ -205,11 +207,18 @@ class MatrixWorldGUI:
         info_frame_width = new_width // 5
         canvas_width = new_width - info_frame_width
 
-        grid_cols = len(self.world.level_matrix[0])
-        grid_rows = len(self.world.level_matrix)
+        grid_cols = len(self.snapshot.cells[0])
+        grid_rows = len(self.snapshot.cells)
         new_cell_size = min(canvas_width / grid_cols, new_height / grid_rows) * self.zoom_factor
 
         self.cell_size = new_cell_size
+        self.rescale_images()
+
+    def rescale_images(self):
+        """
+        Holt alle Bilder in der neuen Zellgröße aus dem AssetCache und baut das Spielfeld neu auf.
+        Einzige Stelle, an der die größenabhängigen Bilder der GUI verworfen werden (Zoom, Resize).
+        """
         self.image_height = int(self.cell_size * 2.5)
 
         # Umgebungsbilder neu laden
@@ -222,96 +231,99 @@ class MatrixWorldGUI:
             path = f"gui/sprites/environment/{name}.png"
             self.location_images[name] = self.load_environment_image(path)
 
-        # Caches leeren
+        # Food‐ und Agenten‐Bilder der alten Größe verwerfen
         self.food_images.clear()
         self.agent_gifs.clear()
         self.agent_images.clear()
         self.draw_grid()
+        if self.selected_agent is not None:
+            self.update_info_panel(self.selected_agent)
 
     def load_environment_image(self, path):
         """
         Lädt ein Umgebungsbild (Gras, Baum, Wasser oder Location) von dem angegebenen Pfad
         und skaliert es exakt auf die Zellengröße (self.cell_size × self.cell_size).
         """
-        image = Image.open(path)
-        image = image.resize((int(self.cell_size), int(self.cell_size)), Image.LANCZOS)
-        return ImageTk.PhotoImage(image)
+        return self.assets.scaled(path, self.cell_size, master=self.root)
 
-    def get_random_food_image(self):
+    def get_random_food_image(self, image_path=None):
         """
-        Wählt ein zufälliges Food-Bild aus dem Verzeichnis, skaliert es so, dass es maximal in die Zelle passt,
-        und gibt das PhotoImage sowie den Pfad zurück.
+        Wählt ein zufälliges Food-Bild aus dem Verzeichnis (oder nimmt image_path), skaliert es so,
+        dass es maximal in die Zelle passt, und gibt das PhotoImage sowie den Pfad zurück.
         """
-        food_dir = "gui/sprites/food"
-        food_files = [f for f in os.listdir(food_dir) if f.endswith('.png')]
-        random_food_file = random.choice(food_files)
-        image_path = os.path.join(food_dir, random_food_file)
-        image = Image.open(image_path)
-        image.thumbnail((self.cell_size, self.cell_size), Image.LANCZOS)
-        return ImageTk.PhotoImage(image), image_path
+        if image_path is None:
+            food_dir = "gui/sprites/food"
+            food_files = [f for f in os.listdir(food_dir) if f.endswith('.png')]
+            random_food_file = self.rng.choice(food_files)
+            image_path = os.path.join(food_dir, random_food_file)
+        return self.assets.thumbnail(image_path, self.cell_size, master=self.root), image_path
+
+    def panel_image(self, path):
+        """Bild für das Info‐Panel, passend in image_height × image_height."""
+        return self.assets.thumbnail(path, self.image_height, master=self.root)
 
     def draw_grid(self):
         """
-        Zeichnet das gesamte Spielfeld: Zellen‐Raster zentriert, dann
+        Baut das gesamte Spielfeld neu auf: Zellen‐Raster zentriert, dann
         Umgebung (Gras), Wall (Baum), Water, Location (+Overlay bei damaged),
         Food und schließlich animierte Agenten.
+        Wird nur beim Start, bei Zoom und bei Größenänderungen aufgerufen. Danach bleiben die Canvas‐Items
+        bestehen und update() zeichnet nur noch Zellen neu, die über mark_dirty gemeldet wurden.
         """
         self.canvas.delete("all")
+        self.cell_items = {}
+        self.agent_items = {}
+        self.dirty_cells.clear()
+        self.selection_key = None
+
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
-        grid_cols = len(self.world.level_matrix[0])
-        grid_rows = len(self.world.level_matrix)
+        grid_cols = len(self.snapshot.cells[0])
+        grid_rows = len(self.snapshot.cells)
         grid_width = grid_cols * self.cell_size
         grid_height = grid_rows * self.cell_size
+        self.layout = (canvas_width, canvas_height, self.cell_size)
 
         # Offset zum Zentrieren
         self.offset_x = max((canvas_width - grid_width) / 2, 0)
         self.offset_y = max((canvas_height - grid_height) / 2, 0)
 
-        for r, row in enumerate(self.world.level_matrix):
+        for r, row in enumerate(self.snapshot.cells):
             for c, cell in enumerate(row):
                 x1 = self.offset_x + c * self.cell_size
                 y1 = self.offset_y + r * self.cell_size
+                items = {"terrain": None, "overlay": None, "food": [], "agents": []}
 
                 # 1) Gras‐Textur in den Hintergrund
                 self.canvas.create_image(x1, y1, anchor=tk.NW, image=self.environment_images["grass"])
 
                 # 2) Wall? → Baum‐Bild
                 if any(isinstance(obj, Wall) for obj in cell):
+                    items["terrain"] = "wall"
                     self.canvas.create_image(x1, y1, anchor=tk.NW, image=self.environment_images["tree"])
 
                 # 3) Sonst: Water? → Wasser‐Bild
                 elif any(isinstance(obj, Water) for obj in cell):
+                    items["terrain"] = "water"
                     self.canvas.create_image(x1, y1, anchor=tk.NW, image=self.environment_images["water"])
 
-                # 4) Sonst: Location? → passendes Location‐Bild + ggf. rotes Overlay
+                # 4) Sonst: Location? → passendes Location‐Bild + verstecktes rotes Overlay für damaged
                 elif any(isinstance(obj, Location) for obj in cell):
+                    items["terrain"] = "location"
                     location_obj = next(obj for obj in cell if isinstance(obj, Location))
                     loc_name = self.location_mapping.get(location_obj, None)
                     if loc_name and loc_name in self.location_images:
                         self.canvas.create_image(x1, y1, anchor=tk.NW, image=self.location_images[loc_name])
 
-                    # Overlay bei damaged == True
-                    if getattr(location_obj, "damaged", False):
-                        x2 = x1 + self.cell_size
-                        y2 = y1 + self.cell_size
-                        overlay_color = "#ff0000"
-                        # 50% Transparenz simulieren
-                        for _ in range(10):
-                            self.canvas.create_rectangle(
-                                x1, y1, x2, y2,
-                                fill=overlay_color, outline="", stipple="gray50"
-                            )
-
-                # 5) Sonst: Food? → Food‐Sprite mittig
-                elif any(isinstance(obj, Food) for obj in cell):
-                    food_obj = next(obj for obj in cell if isinstance(obj, Food))
-                    self.draw_food(food_obj, x1, y1)
-
-                # 6) Zum Schluss: Agenten (animierte GIFs) auf die Zelle legen
-                for obj in cell:
-                    if isinstance(obj, AgentConstruct):
-                        self.draw_agent(obj, x1, y1)
+                    # 50% Transparenz simulieren (ein Stipple‐Rechteck reicht, gestapelte ergeben dasselbe Muster)
+                    items["overlay"] = self.canvas.create_rectangle(
+                        x1, y1, x1 + self.cell_size, y1 + self.cell_size,
+                        fill="#ff0000", outline="", stipple="gray50", state=tk.HIDDEN
+                    )
+
+                self.cell_items[(r, c)] = items
+                # 5) + 6) Food und Agenten sind die veränderlichen Ebenen der Zelle
+                self.draw_cell(r, c)
 
         # Rotes Overlay um das ausgewählte Objekt (Agent oder anderes) zeichnen
         self.draw_red_overlay()
@@ -319,6 +331,45 @@ class MatrixWorldGUI:
         # Scrollregion anpassen
         self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
 
+    def draw_cell(self, r, c):
+        """
+        Aktualisiert die veränderlichen Ebenen einer Zelle: Damaged‐Overlay, Food und Agenten.
+        """
+        items = self.cell_items[(r, c)]
+        cell = self.snapshot.cells[r][c]
+        x1 = self.offset_x + c * self.cell_size
+        y1 = self.offset_y + r * self.cell_size
+
+        # Overlay bei damaged == True einblenden
+        if items["overlay"] is not None:
+            damaged = (r, c) in self.snapshot.damaged
+            self.canvas.itemconfigure(items["overlay"], state=tk.NORMAL if damaged else tk.HIDDEN)
+
+        for item in items["food"]:
+            self.canvas.delete(item)
+        for item in items["agents"]:
+            self.canvas.delete(item)
+            self.agent_items.pop(item, None)
+        items["food"] = []
+        items["agents"] = []
+
+        # Food‐Sprite mittig, nur auf freien Zellen
+        if items["terrain"] is None:
+            food_obj = next((obj for obj in cell if isinstance(obj, Food)), None)
+            if food_obj is not None:
+                items["food"].append(self.draw_food(food_obj, x1, y1))
+
+        # Agenten (animierte GIFs) auf die Zelle legen
+        for obj in cell:
+            if isinstance(obj, AgentConstruct):
+                items["agents"].append(self.draw_agent(obj, x1, y1))
+
+    def mark_dirty(self, *cells):
+        """
+        Merkt Zellen (Zeile, Spalte) vor, die sich geändert haben. Sie werden beim nächsten update() neu gezeichnet.
+        """
+        self.dirty_cells.update(cells)
+
     def draw_red_overlay(self):
         """
         Zeichnet ein halbtransparentes rotes Overlay:
@@ -326,11 +377,27 @@ class MatrixWorldGUI:
           markiert.
         - Wenn ein anderes Objekt ausgewählt ist (Food, Wall, Water, Location),
           dann wird nur die jeweilige Zelle markiert.
+        Das Overlay wird nur neu gezeichnet, wenn sich Auswahl oder Position des ausgewählten Objekts ändern.
         """
-        if not self.selected_agent:
+        if self.selected_agent is None:
+            if self.selection_key is not None:
+                self.canvas.delete("selection")
+                self.selection_key = None
             return
 
-        col, row = self.find_agent_position(self.selected_agent)
+        if isinstance(self.selected_agent, AgentConstruct):
+            col, row = self.find_agent_position(self.selected_agent)
+        else:
+            # Walls und Water sind in allen Zellen dasselbe Objekt, deshalb zählt die angeklickte Zelle
+            row, col = self.selected_cell
+            if self.selected_agent not in self.snapshot.cells[row][col]:
+                # z.B. gefressenes Food
+                col, row = None, None
+        selection_key = (self.selected_agent, col, row)
+        if selection_key == self.selection_key:
+            return
+        self.selection_key = selection_key
+        self.canvas.delete("selection")
         if col is None or row is None:
             return
 
@@ -340,8 +407,8 @@ class MatrixWorldGUI:
         if isinstance(self.selected_agent, AgentConstruct):
             los_range = getattr(self.selected_agent, "los", 0)
             # Lässt uns nicht über das Spielfeld hinauszeichnen
-            grid_cols = len(self.world.level_matrix[0])
-            grid_rows = len(self.world.level_matrix)
+            grid_cols = len(self.snapshot.cells[0])
+            grid_rows = len(self.snapshot.cells)
 
             for dx in range(-los_range, los_range + 1):
                 for dy in range(-los_range, los_range + 1):
@@ -352,13 +419,14 @@ class MatrixWorldGUI:
                         y1 = self.offset_y + y * self.cell_size
                         x2 = x1 + self.cell_size
                         y2 = y1 + self.cell_size
-                        for _ in range(10):  # ≈50% Transparenz
-                            self.canvas.create_rectangle(
-                                x1, y1, x2, y2,
-                                fill=overlay_color,
-                                outline="",
-                                stipple="gray50"
-                            )
+                        # ≈50% Transparenz
+                        self.canvas.create_rectangle(
+                            x1, y1, x2, y2,
+                            fill=overlay_color,
+                            outline="",
+                            stipple="gray50",
+                            tags=("selection",)
+                        )
         else:
             # Wenn ausgewähltes Objekt kein Agent ist (Food, Wall, Water, Location),
             # dann nur die jeweilige Zelle hervorheben
@@ -366,20 +434,23 @@ class MatrixWorldGUI:
             y1 = self.offset_y + row * self.cell_size
             x2 = x1 + self.cell_size
             y2 = y1 + self.cell_size
-            for _ in range(10):
-                self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=overlay_color,
-                    outline="",
-                    stipple="gray50"
-                )
+            self.canvas.create_rectangle(
+                x1, y1, x2, y2,
+                fill=overlay_color,
+                outline="",
+                stipple="gray50",
+                tags=("selection",)
+            )
 
 
     def find_agent_position(self, agent):
         """
         Gibt (Spalte, Zeile) zurück, in welcher sich das gegebene Objekt befindet.
         """
-        for r, row in enumerate(self.world.level_matrix):
+        if isinstance(agent, AgentConstruct):
+            r, c = self.snapshot.find_agent(agent)
+            return c, r
+        for r, row in enumerate(self.snapshot.cells):
             for c, cell in enumerate(row):
                 if agent in cell:
                     return c, r
@@ -387,61 +458,51 @@ class MatrixWorldGUI:
 
     def draw_food(self, food, x, y):
         """
-        Zeichnet ein Food‐Objekt mittig in der Zelle.
+        Zeichnet ein Food‐Objekt mittig in der Zelle und gibt die Canvas‐Item‐ID zurück.
         """
         if food not in self.food_images:
-            self.food_images[food], food.image_path = self.get_random_food_image()
+            # Nach Zoom/Resize behält das Food sein Bild, es wird nur neu skaliert
+            self.food_images[food], food.image_path = self.get_random_food_image(getattr(food, "image_path", None))
         cx = x + self.cell_size / 2
         cy = y + self.cell_size / 2
-        self.canvas.create_image(cx, cy, anchor=tk.CENTER, image=self.food_images[food])
+        return self.canvas.create_image(cx, cy, anchor=tk.CENTER, image=self.food_images[food])
 
     def draw_agent(self, agent, x, y):
         """
-        Zeichnet den animierten Agenten‐GIF mittig in der Zelle.
-        Die GIF‐Frames werden skaliert auf 80% der Zellgröße.
+        Zeichnet den animierten Agenten‐GIF mittig in der Zelle und gibt die Canvas‐Item‐ID zurück.
+        Die GIF‐Frames werden skaliert auf 80% der Zellgröße, weitergeschaltet werden sie in animate_agents.
         """
         gif_path = f"gui/sprites/pokemon/gif/{agent.name_number}.gif"
         agent_size = int(self.cell_size * 0.8)
 
         if gif_path not in self.agent_gifs:
-            image = Image.open(gif_path)
-            frames = [
-                ImageTk.PhotoImage(
-                    self.resize_image_keep_aspect(frame, agent_size, agent_size),
-                    master=self.root
-                )
-                for frame in ImageSequence.Iterator(image)
-            ]
-            self.agent_gifs[gif_path] = frames
+            # Alle Frames einmal pro Zoomstufe, dekodiert wird das GIF nur einmal
+            self.agent_gifs[gif_path] = self.assets.gif_frames(gif_path, agent_size, master=self.root)
             self.agent_images[gif_path] = 0
 
         frames = self.agent_gifs[gif_path]
         idx = self.agent_images[gif_path]
         cx = x + self.cell_size / 2
         cy = y + self.cell_size / 2
-        self.canvas.create_image(cx, cy, anchor=tk.CENTER, image=frames[idx])
-        self.agent_images[gif_path] = (idx + 1) % len(frames)
+        item = self.canvas.create_image(cx, cy, anchor=tk.CENTER, image=frames[idx])
+        self.agent_items[item] = gif_path
+        return item
 
-    def resize_image_keep_aspect(self, image, max_width, max_height):
+    def animate_agents(self):
         """
-        Skaliert ein PIL‐Image so, dass es innerhalb von (max_width × max_height)
-        bleibt, ohne das Seitenverhältnis zu verändern.
+        Schaltet alle Agenten‐GIFs einen Frame weiter, ohne die Canvas‐Items neu anzulegen.
         """
-        original_width, original_height = image.size
-        ratio = min(max_width / original_width, max_height / original_height)
-        new_w = int(original_width * ratio)
-        new_h = int(original_height * ratio)
-        return image.resize((new_w, new_h), Image.LANCZOS)
+        for gif_path, frames in self.agent_gifs.items():
+            self.agent_images[gif_path] = (self.agent_images[gif_path] + 1) % len(frames)
+        for item, gif_path in self.agent_items.items():
+            self.canvas.itemconfigure(item, image=self.agent_gifs[gif_path][self.agent_images[gif_path]])
 
     def update_info_panel(self, obj):
         """
         Zeigt im rechten Info‐Panel Details zum ausgewählten Objekt an:
         Agent, Food, Wall, Water oder Location.
         """
-        # 1) Visual Stimuli‐Frame leeren
-        for widget in self.visual_stimuli_frame.winfo_children():
-            widget.destroy()
-        # 2) Alle Widgets im info_frame löschen, außer agent_info_frame, visual_stimuli_frame & Titel
+        # Alle Widgets im info_frame löschen, außer agent_info_frame, visual_stimuli_frame & Titel
         for widget in self.info_frame.winfo_children():
             if widget not in {self.agent_info_frame, self.visual_stimuli_frame, self.visual_stimuli_title}:
                 widget.destroy()
@@ -449,9 +510,7 @@ class MatrixWorldGUI:
         if isinstance(obj, AgentConstruct):
             # Agent anzeigen
             png_path = f"gui/sprites/pokemon/png/{obj.name_number}.png"
-            image = Image.open(png_path)
-            image.thumbnail((self.image_height, self.image_height), Image.LANCZOS)
-            agent_image = ImageTk.PhotoImage(image)
+            agent_image = self.panel_image(png_path)
             self.agent_image_label.config(image=agent_image)
             self.agent_image_label.image = agent_image
             self.agent_name_label.config(text=obj.name)
@@ -459,8 +518,8 @@ class MatrixWorldGUI:
             self.visual_stimuli_title.pack(padx=10, pady=10)
             self.visual_stimuli_frame.pack(padx=10, pady=10)
 
-            visual_stimuli = obj.visual_stimuli
-            self.draw_matrix(visual_stimuli)
+            # Aus dem Snapshot, die Simulation kann gleichzeitig in einem anderen Thread laufen
+            self.draw_matrix(self.snapshot.visual_stimuli.get(obj, ()))
 
         elif isinstance(obj, Food):
             # Food anzeigen
@@ -472,9 +531,10 @@ class MatrixWorldGUI:
             self.visual_stimuli_title.pack_forget()
             self.visual_stimuli_frame.pack_forget()
 
+            saturation, amount, time_till_regrowth = self.selected_food_info()
             self.saturation_label = tk.Label(
                 self.info_frame,
-                text=f"Saturation: {obj.get_saturation()}",
+                text=f"Saturation: {saturation}",
                 fg="white", bg='#171717',
                 font=("Helvetica", 12), anchor='center'
             )
@@ -482,7 +542,7 @@ class MatrixWorldGUI:
 
             self.amount_label = tk.Label(
                 self.info_frame,
-                text=f"Amount: {obj.get_amount()}",
+                text=f"Amount: {amount}",
                 fg="white", bg='#171717',
                 font=("Helvetica", 12), anchor='center'
             )
@@ -490,7 +550,7 @@ class MatrixWorldGUI:
 
             self.regrowth_label = tk.Label(
                 self.info_frame,
-                text=f"Time till regrowth: {obj.get_time_till_regrowth()}",
+                text=f"Time till regrowth: {time_till_regrowth}",
                 fg="white", bg='#171717',
                 font=("Helvetica", 12), anchor='center'
             )
@@ -499,9 +559,7 @@ class MatrixWorldGUI:
         elif isinstance(obj, Wall):
             # Wall anzeigen
             png_path = "gui/sprites/environment/tree.png"
-            image = Image.open(png_path)
-            image.thumbnail((self.image_height, self.image_height), Image.LANCZOS)
-            wall_image = ImageTk.PhotoImage(image)
+            wall_image = self.panel_image(png_path)
             self.agent_image_label.config(image=wall_image)
             self.agent_image_label.image = wall_image
             self.agent_name_label.config(text="Wall")
@@ -519,9 +577,7 @@ class MatrixWorldGUI:
         elif isinstance(obj, Water):
             # Water anzeigen
             png_path = "gui/sprites/environment/water.png"
-            image = Image.open(png_path)
-            image.thumbnail((self.image_height, self.image_height), Image.LANCZOS)
-            water_image = ImageTk.PhotoImage(image)
+            water_image = self.panel_image(png_path)
             self.agent_image_label.config(image=water_image)
             self.agent_image_label.image = water_image
             self.agent_name_label.config(text="Water")
@@ -541,9 +597,7 @@ class MatrixWorldGUI:
             loc_name = self.location_mapping.get(obj, "Unknown")
             png_path = f"gui/sprites/environment/{loc_name}.png"
             if os.path.exists(png_path):
-                image = Image.open(png_path)
-                image.thumbnail((self.image_height, self.image_height), Image.LANCZOS)
-                loc_image = ImageTk.PhotoImage(image)
+                loc_image = self.panel_image(png_path)
                 self.agent_image_label.config(image=loc_image)
                 self.agent_image_label.image = loc_image
 
@@ -551,8 +605,7 @@ class MatrixWorldGUI:
             self.visual_stimuli_title.pack_forget()
             self.visual_stimuli_frame.pack_forget()
 
-            damaged_flag = getattr(obj, "damaged", False)
-            status_text = "Damaged" if damaged_flag else "Intact"
+            status_text = "Damaged" if self.selected_cell in self.snapshot.damaged else "Intact"
             self.location_status_label = tk.Label(
                 self.info_frame,
                 text=f"Status: {status_text}",
@@ -571,54 +624,103 @@ class MatrixWorldGUI:
             x -= self.offset_x
             y -= self.offset_y
         r, c = int(y // self.cell_size), int(x // self.cell_size)
-        if 0 <= r < len(self.world.level_matrix) and 0 <= c < len(self.world.level_matrix[0]):
-            for obj in self.world.level_matrix[r][c]:
+        if 0 <= r < len(self.snapshot.cells) and 0 <= c < len(self.snapshot.cells[0]):
+            for obj in self.snapshot.cells[r][c]:
                 if isinstance(obj, (AgentConstruct, Food, Wall, Water, Location)):
                     self.selected_agent = obj
+                    self.selected_cell = None if isinstance(obj, AgentConstruct) else (r, c)
                     self.update_info_panel(self.selected_agent)
                     break
 
     def update(self):
         """
-        Zeichnet das Spielfeld neu und sorgt dafür, dass Agenten‐GIFs animiert bleiben.
-        Wird alle 50 ms erneut aufgerufen.
+        Holt den neuesten WorldSnapshot, zeichnet die seitdem geänderten Zellen neu und sorgt dafür,
+        dass Agenten‐GIFs animiert bleiben. Nur wenn sich die Canvas‐Größe geändert hat, wird das ganze
+        Spielfeld neu aufgebaut. Läuft mit fester Bildrate (self.fps), unabhängig davon, wie schnell die
+        Simulation Snapshots veröffentlicht; Zwischenstände werden übersprungen.
         """
-        self.draw_grid()
-        self.root.update_idletasks()
-        self.root.update()
-        self.root.after(50, self.update)
+        snapshot, changed = self.world.snapshots.take()
+        if snapshot is not None:
+            self.snapshot = snapshot
+            self.dirty_cells.update(changed)
+
+        layout = (self.canvas.winfo_width(), self.canvas.winfo_height(), self.cell_size)
+        if layout != self.layout:
+            self.draw_grid()
+        elif self.dirty_cells:
+            for r, c in self.dirty_cells:
+                self.draw_cell(r, c)
+            self.dirty_cells.clear()
+            self.draw_red_overlay()
+            self.canvas.tag_raise("selection")
+        else:
+            self.draw_red_overlay()
+        self.animate_agents()
+        self.root.after(1000 // self.fps, self.update)
 
     def draw_matrix(self, matrix):
         """
         Zeichnet die Visual Stimuli‐Matrix (z. B. für Agenten‐Info) im Info‐Panel.
+        Die Labels bleiben bestehen, geändert wird nur der Text von Zellen mit neuem Symbol.
+        Nur wenn sich die Form des Sichtfelds ändert, wird das Gitter neu aufgebaut.
         """
-        for widget in self.visual_stimuli_frame.winfo_children():
-            widget.destroy()
+        texts = [[val if val else " " for val in row] for row in matrix]
+        shape = [len(row) for row in texts]
+        if shape != [len(row) for row in self.stimuli_texts]:
+            for widget in self.visual_stimuli_frame.winfo_children():
+                widget.destroy()
+            self.stimuli_labels = []
+            for i, row in enumerate(texts):
+                labels = []
+                for j, cell_text in enumerate(row):
+                    cell_label = tk.Label(
+                        self.visual_stimuli_frame,
+                        text=cell_text, fg="white", bg='#171717',
+                        relief='solid', borderwidth=1, width=4, height=2,
+                        highlightbackground="white", highlightcolor="white", highlightthickness=1
+                    )
+                    cell_label.grid(row=i, column=j, padx=1, pady=1)
+                    labels.append(cell_label)
+                self.stimuli_labels.append(labels)
+            self.stimuli_texts = texts
+            return
+
+        for i, row in enumerate(texts):
+            shown = self.stimuli_texts[i]
+            for j, cell_text in enumerate(row):
+                if cell_text != shown[j]:
+                    self.stimuli_labels[i][j].config(text=cell_text)
+                    shown[j] = cell_text
 
-        for i, row in enumerate(matrix):
-            for j, val in enumerate(row):
-                cell_text = val if val else " "
-                cell_label = tk.Label(
-                    self.visual_stimuli_frame,
-                    text=cell_text, fg="white", bg='#171717',
-                    relief='solid', borderwidth=1, width=4, height=2,
-                    highlightbackground="white", highlightcolor="white", highlightthickness=1
-                )
-                cell_label.grid(row=i, column=j, padx=1, pady=1)
+    def refresh_info_panel(self):
+        """
+        Aktualisiert die veränderlichen Teile des Info‐Panels in place, ohne Widgets neu anzulegen.
+        Der komplette Aufbau passiert nur in update_info_panel, wenn sich die Auswahl ändert.
+        Gelesen wird nur aus dem aktuellen Snapshot, nie aus den lebenden Agenten oder der Welt.
+        """
+        if isinstance(self.selected_agent, AgentConstruct):
+            self.draw_matrix(self.snapshot.visual_stimuli.get(self.selected_agent, ()))
+        elif isinstance(self.selected_agent, Food):
+            saturation, amount, time_till_regrowth = self.selected_food_info()
+            self.saturation_label.config(text=f"Saturation: {saturation}")
+            self.amount_label.config(text=f"Amount: {amount}")
+            self.regrowth_label.config(text=f"Time till regrowth: {time_till_regrowth}")
+        elif isinstance(self.selected_agent, Location):
+            status_text = "Damaged" if self.selected_cell in self.snapshot.damaged else "Intact"
+            self.location_status_label.config(text=f"Status: {status_text}")
+
+    def selected_food_info(self):
+        """
+        Gibt (saturation, amount, time_till_regrowth) des ausgewählten Foods aus dem Snapshot zurück,
+        "-" für alle Werte, falls es dort nicht mehr liegt.
+        """
+        return self.snapshot.food.get(self.selected_cell, ("-", "-", "-"))
 
     def schedule_visual_stimuli_update(self):
         """
         Aktualisiert Info‐Panel bzw. Status‐Labels (Food, Location) alle 1000 ms.
         """
         if self.selected_agent is not None:
-            self.update_info_panel(self.selected_agent)
-            if isinstance(self.selected_agent, Food):
-                self.saturation_label.config(text=f"Saturation: {self.selected_agent.get_saturation()}")
-                self.amount_label.config(text=f"Amount: {self.selected_agent.get_amount()}")
-                self.regrowth_label.config(text=f"Time till regrowth: {self.selected_agent.get_time_till_regrowth()}")
-            elif isinstance(self.selected_agent, Location):
-                damaged_flag = getattr(self.selected_agent, "damaged", False)
-                status_text = "Damaged" if damaged_flag else "Intact"
-                self.location_status_label.config(text=f"Status: {status_text}")
+            self.refresh_info_panel()
 
         self.root.after(1000, self.schedule_visual_stimuli_update)
@@ -10,6 +10,7 @@ class StepLogWindow:
     def __init__(self, master=None, tracer=None, simulation=None, title="Stepper Log"):
         self.tracer     = tracer
         self.simulation = simulation
+        self.rng        = random.Random()  # Farben ziehen nicht aus dem Seed der Simulation
 
         # Hauptfenster oder Toplevel
         self.window = tk.Toplevel(master) if master else tk.Tk()
@@ -52,7 +53,7 @@ class StepLogWindow:
         self.data_canvas  = tk.Canvas(self.plot_frame, background="#2e1111")
         # Scrollbars
         self.vsb = tk.Scrollbar(self.plot_frame, orient="vertical", command=self._on_vertical_scroll)
-        self.hsb = tk.Scrollbar(self.plot_frame, orient="horizontal", command=self.data_canvas.xview)
+        self.hsb = tk.Scrollbar(self.plot_frame, orient="horizontal", command=self._on_horizontal_scroll)
 
         # Verknüpfen
         self.label_canvas.configure(yscrollcommand=self.vsb.set)
@@ -79,8 +80,18 @@ class StepLogWindow:
         # Farb‑Map (Pastelltöne)
         self.color_map = {}
 
-        # Für den PNG‑Export
-        self.pil_image = None
+        # Virtualisierte Zeitleiste: nur die sichtbaren Spalten (plus overscan_columns links und rechts)
+        # existieren als Canvas-Items. drawn_layout ist (agent_name, layout_version) des AgentLogs,
+        # drawn_range die gezeichneten absoluten Spalten [lo, hi), drawn_entries die nächste Eintragsnummer.
+        self.margin_y          = 30
+        self.cell_h            = self.base_cell_h
+        self.label_w           = 20
+        self.overscan_columns  = 2
+        self.drawn_layout      = None
+        self.drawn_range       = (0, 0)
+        self.drawn_entries     = 0
+        self.drawn_start       = 0
+        self.known_agent_count = -1
 
         # Redraw bei Resize
         self.data_canvas.bind('<Configure>', lambda e: self.redraw_current())
@@ -94,8 +105,17 @@ class StepLogWindow:
         self.label_canvas.yview(*args)
         self.data_canvas .yview(*args)
 
+    def _on_horizontal_scroll(self, *args):
+        self.data_canvas.xview(*args)
+        # Neu sichtbare Spalten erzeugen, verlassene löschen
+        self.redraw_current()
+
     def refresh_agent_list(self):
         names = sorted(self.tracer.known_agents) if self.tracer else []
+        # Die Liste nur neu aufbauen, wenn ein Agent dazugekommen ist
+        if len(names) == self.known_agent_count:
+            return
+        self.known_agent_count = len(names)
         prev  = self.current_agent
         self.listbox.delete(0, tk.END)
         for n in names:
@@ -123,114 +143,187 @@ class StepLogWindow:
         self.show_agent_logs(self.current_agent)
 
     def show_agent_logs(self, agent_name: str):
-        # Filtere Records
-        recs = [r for r in self.tracer.records if r["agent_name"] == agent_name]
-        if not recs:
+        log = self.tracer.agent_log(agent_name)
+        if log is None or not len(log):
             return
 
-        types = sorted({r["type"] for r in recs})
-        times = sorted({r["timestamp"] for r in recs})
-        margin_y = 30
-
-        # Maße für Typ‑Labels
-        max_type_w = max((self.font.measure(str(t)) for t in types), default=0)
-        line_h     = self.font.metrics("linespace")
+        # Neues Layout (anderer Agent, neue Zeile, größere Zellen): komplett neu zeichnen,
+        # sonst nur neue Einträge und neu ins Scrollfenster gerückte Spalten
+        if self.drawn_layout != (agent_name, log.layout_version):
+            self._draw_layout(agent_name, log)
+        self._draw_visible(log)
+
+    def _cell_height(self, log):
+        line_h = self.font.metrics("linespace")
+        return max(self.base_cell_h, log.max_lines*line_h + 4)
+
+    def _type_color(self, typ):
+        if typ not in self.color_map:
+            # helle Pastelltöne
+            r_col = self.rng.randint(180,255)
+            g_col = self.rng.randint(180,255)
+            b_col = self.rng.randint(180,255)
+            self.color_map[typ] = f'#{r_col:02x}{g_col:02x}{b_col:02x}'
+        return self.color_map[typ]
+
+    def _draw_layout(self, agent_name, log):
+        self.label_canvas.delete("all")
+        self.data_canvas .delete("all")
 
-        # Bestimme Zeilenhöhe nach Zeilenumbrüchen im Event‑Text
-        event_texts = [str(r["event"]) for r in recs if r.get("event") is not None]
-        max_lines   = max((t.count('\n')+1 for t in event_texts), default=1)
-        cell_h      = max(self.base_cell_h, max_lines*line_h + 4)
+        self.cell_h  = self._cell_height(log)
+        max_type_w   = max((self.font.measure(str(t)) for t in log.types), default=0)
+        self.label_w = max_type_w + 20
 
-        cols       = len(times)
-        rows       = len(types)
-        total_h    = margin_y + rows*cell_h + 20
-        total_w    = cols*self.cell_w + 20
-        label_w    = max_type_w + 20
+        # Zeilen‑Labels (persistent, weiß)
+        for i, t in enumerate(log.types):
+            y = self.margin_y + i*self.cell_h + self.cell_h//2
+            self.label_canvas.create_text(self.label_w//2, y,
+                                          text=str(t), fill="white",
+                                          font=self.font)
 
-        # Leere Canvases & SCROLLREGION
-        self.label_canvas.delete("all")
-        self.data_canvas .delete("all")
-        self.label_canvas.config(scrollregion=(0,0,label_w, total_h))
-        self.data_canvas .config(scrollregion=(0,0,total_w, total_h))
+        self.drawn_layout  = (agent_name, log.layout_version)
+        self.drawn_range   = (0, 0)
+        self.drawn_entries = log.start
+        self.drawn_start   = log.start
+
+    def _visible_columns(self, log):
+        """Absolute Spalten [lo, hi), die im Scrollfenster liegen, inklusive Overscan."""
+        width = self.data_canvas.winfo_width()
+        if width <= 1:
+            # Noch nicht gemappt
+            width = self.screen_w
+        x0 = self.data_canvas.canvasx(0)
+        lo = int(x0 // self.cell_w) - self.overscan_columns
+        hi = int((x0 + width) // self.cell_w) + 1 + self.overscan_columns
+        return max(lo, log.first_column), min(hi, log.last_column)
+
+    def _draw_visible(self, log):
+        cell_h = self.cell_h
+
+        # Scrollregion beginnt bei der ältesten gehaltenen Spalte
+        total_h = self.margin_y + len(log.types)*cell_h + 20
+        self.label_canvas.config(scrollregion=(0, 0, self.label_w, total_h))
+        self.data_canvas .config(scrollregion=(log.first_column*self.cell_w, 0,
+                                               log.last_column*self.cell_w + 20, total_h))
+
+        old_lo, old_hi = self.drawn_range
+        lo, hi = self._visible_columns(log)
+
+        # Hat der Ringpuffer Einträge aus der ersten, weiter bestehenden Spalte verdrängt,
+        # wird diese Spalte neu gezeichnet
+        stale = log.first_column if log.start > self.drawn_start else None
+        self.drawn_start = log.start
+
+        def kept(col):
+            return old_lo <= col < old_hi and lo <= col < hi and col != stale
+
+        # Neue Einträge in Spalten, die schon gezeichnet sind und sichtbar bleiben
+        for number in range(max(self.drawn_entries, log.start), log.count):
+            index, i, j = log.entry(number)
+            if kept(j):
+                self._draw_entry(index, i, j)
+        self.drawn_entries = log.count
+
+        # Verlassene Spalten löschen (auch vom Ringpuffer verdrängte), neue Spalten komplett zeichnen
+        for col in range(old_lo, old_hi):
+            if not kept(col):
+                self.data_canvas.delete(f"col{col}")
+        for col in range(lo, hi):
+            if not kept(col):
+                self._draw_column(log, col)
+        self.drawn_range = (lo, hi)
+
+    def _draw_column(self, log, col):
+        ts = log.times[col - log.first_column]
+        x  = col*self.cell_w + self.cell_w//2
+        self.data_canvas.create_text(x, self.margin_y//2,
+                                     text=f"{ts:.2f}", fill="white",
+                                     font=self.font, tags=(f"col{col}",))
+        for number in log.column_entries(col):
+            index, i, j = log.entry(number)
+            self._draw_entry(index, i, j)
+
+    def _draw_entry(self, index, i, j):
+        r  = self.tracer.record(index)
+        x1 = j*self.cell_w
+        y1 = self.margin_y + i*self.cell_h
+        x2 = x1 + self.cell_w
+        y2 = y1 + self.cell_h
+        tags = (f"col{j}",)
+
+        self.data_canvas.create_rectangle(x1, y1, x2, y2,
+                                          fill=self._type_color(r["type"]),
+                                          outline="white", tags=tags)
+        evt = r.get("event")
+        if evt is not None:
+            self.data_canvas.create_text(x1 + self.cell_w/2,
+                                         y1 + self.cell_h/2,
+                                         text=str(evt), fill="black",
+                                         font=self.font,
+                                         width=self.cell_w-4, tags=tags)
+
+    def render_png(self, agent_name):
+        """Zeichnet den gehaltenen Verlauf des Agenten als PIL‑Bild (nur für den Export)."""
+        log = self.tracer.agent_log(agent_name)
+        if log is None or not len(log):
+            return None
+
+        margin_y = self.margin_y
+        line_h   = self.font.metrics("linespace")
+        cell_h   = self._cell_height(log)
+        max_type_w = max((self.font.measure(str(t)) for t in log.types), default=0)
+        label_w  = max_type_w + 20
+        total_h  = margin_y + len(log.types)*cell_h + 20
+        total_w  = len(log.times)*self.cell_w + 20
 
-        # Neues PIL‑Bild (für Export)
         img  = Image.new("RGB", (label_w+total_w, total_h), "#2e1111")
         draw = ImageDraw.Draw(img)
         pil_font = ImageFont.load_default()
 
-        # 1) Zeilen‑Labels (persistent, weiß)
-        for i, t in enumerate(types):
+        # 1) Zeilen‑Labels
+        for i, t in enumerate(log.types):
             y = margin_y + i*cell_h + cell_h//2
-            # Tk‑Canvas
-            self.label_canvas.create_text(label_w//2, y,
-                                          text=str(t), fill="white",
-                                          font=self.font)
-            # PIL
             draw.text((5, y - line_h//2), str(t), fill="white", font=pil_font)
 
         # 2) Zeit‑Labels oben
-        for j, ts in enumerate(times):
+        for j, ts in enumerate(log.times):
             x = j*self.cell_w + self.cell_w//2
-            # Tk‑Canvas
-            self.data_canvas.create_text(x, margin_y//2,
-                                        text=f"{ts:.2f}", fill="white",
-                                        font=self.font)
-            # PIL
             draw.text((label_w + x - self.font.measure(f"{ts:.2f}")//2, 5),
                       f"{ts:.2f}", fill="white", font=pil_font)
 
         # 3) Blöcke & Events
-        for r in recs:
-            i = types.index(r["type"])
-            j = times.index(r["timestamp"])
-            x1 = j*self.cell_w
+        for number in range(log.start, log.count):
+            index, i, j = log.entry(number)
+            r  = self.tracer.record(index)
+            x1 = (j - log.first_column)*self.cell_w
             y1 = margin_y + i*cell_h
             x2 = x1 + self.cell_w
             y2 = y1 + cell_h
-
-            typ = r["type"]
-            if typ not in self.color_map:
-                # helle Pastelltöne
-                r_col = random.randint(180,255)
-                g_col = random.randint(180,255)
-                b_col = random.randint(180,255)
-                self.color_map[typ] = f'#{r_col:02x}{g_col:02x}{b_col:02x}'
-            fill = self.color_map[typ]
-
-            # Tk‑Canvas
-            self.data_canvas.create_rectangle(x1, y1, x2, y2,
-                                              fill=fill, outline="white")
-            evt = r.get("event")
-            if evt is not None:
-                self.data_canvas.create_text(x1 + self.cell_w/2,
-                                             y1 + cell_h/2,
-                                             text=str(evt), fill="black",
-                                             font=self.font,
-                                             width=self.cell_w-4)
-
-            # PIL
             draw.rectangle([label_w + x1, y1, label_w + x2, y2],
-                           fill=fill, outline="white")
+                           fill=self._type_color(r["type"]), outline="white")
+            evt = r.get("event")
             if evt is not None:
                 # zentriert mehrzeilig
-                lines = evt.split('\n')
+                lines = str(evt).split('\n')
                 for k, line in enumerate(lines):
                     wy = y1 + k*line_h + 2
                     # horizontale Zentrierung
                     lw = draw.textlength(line, font=pil_font)
                     wx = label_w + x1 + (self.cell_w - lw)/2
                     draw.text((wx, wy), line, fill="black", font=pil_font)
-
-        # Merke für Download
-        self.pil_image = img
+        return img
 
     def on_download(self):
-        if not self.pil_image:
+        if not self.current_agent:
+            return
+        # Das Bild wird erst beim Export erzeugt, nicht bei jedem Schritt
+        img = self.render_png(self.current_agent)
+        if img is None:
             return
         path = filedialog.asksaveasfilename(defaultextension=".png",
                                             filetypes=[("PNG files", "*.png")])
         if path:
-            self.pil_image.save(path)
+            img.save(path)
 
     def log(self, message: str = None):
         self.refresh_agent_list()
@@ -3,16 +3,47 @@ Base implementation for rules, rule sequences, productions, and production seque
 """
 
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Iterable
 from copy import copy
 from pyactr import ACTRModel
 
 from pyactr_oo_syntax.base.chunk import AdvChunk
+from pyactr_oo_syntax.base.rule_cache import add_rule_to_model
 from pyactr_oo_syntax.helpers.data_types import RuleType, Buffer
 
 
 ## Foundation Classes: rule_, rule_sequence_, production, production_sequence ##
 
+class _persistent_sequence():
+    # Immutable sequence with structural sharing: combining two sequences only links them, the items are flattened
+    # into a tuple once on first access. Chains of & or + therefore take linear instead of quadratic time.
+    def __init__(self, items=()):
+        self._items: tuple|None = tuple(items)
+        self._parts: tuple[_persistent_sequence, ...] = ()
+
+    @classmethod
+    def _joined(cls, left:_persistent_sequence, right:_persistent_sequence):
+        joined = cls.__new__(cls)
+        joined._items = None
+        joined._parts = (left, right)
+        return joined
+
+    def _flattened(self) -> tuple:
+        if self._items is None:
+            items = []
+            # iterative, since long left-nested chains would exceed the recursion limit
+            stack = [self]
+            while stack:
+                sequence = stack.pop()
+                if sequence._items is not None:
+                    items.extend(sequence._items)
+                else:
+                    stack.extend(reversed(sequence._parts))
+            self._items = tuple(items)
+            self._parts = ()
+        return self._items
+
+
 class rule_():
     def __init__(self, rule_type:RuleType, buffer_name:Buffer|Callable[[str|None],str], imaginal_buffer_name:str|None=None, isa:str|None=None, **chunk_content):
         self.__rule_type:RuleType = rule_type
@@ -28,45 +59,45 @@ class rule_():
 
     def __and__(self, other:rule_|rule_sequence_) -> rule_sequence_:
         if isinstance(other, rule_):
-            return rule_sequence_(rules=[copy(self), copy(other)])
+            return rule_sequence_(rules=(self, other))
         elif isinstance(other, rule_sequence_):
-            return rule_sequence_(rules=[copy(self)]) & other
+            return rule_sequence_(rules=(self,)) & other
         else:
             return NotImplemented
         
     def __rshift__(self, other:rule_|rule_sequence_) -> production:
         if isinstance(other, rule_):
-            return production(lhs=rule_sequence_(rules=[copy(self)]), rhs=rule_sequence_(rules=[copy(other)]))
+            return production(lhs=rule_sequence_(rules=(self,)), rhs=rule_sequence_(rules=(other,)))
         elif isinstance(other, rule_sequence_):
-            return production(lhs=rule_sequence_(rules=[copy(self)]), rhs=copy(other))
+            return production(lhs=rule_sequence_(rules=(self,)), rhs=other)
         else:
             return NotImplemented
 
 
-class rule_sequence_():
-    def __init__(self, rules: list[rule_]):
-        self.rules: list[rule_] = rules
+class rule_sequence_(_persistent_sequence):
+    def __init__(self, rules: Iterable[rule_]=()):
+        super().__init__(rules)
+
+    @property
+    def rules(self) -> tuple[rule_, ...]:
+        return self._flattened()
 
     def __str__(self) -> str:
         return '\n'.join(map(str, self.rules))  
 
     def __and__(self, other:rule_|rule_sequence_) -> rule_sequence_:
         if isinstance(other, rule_):
-            new_rules = copy(self.rules)
-            new_rules.append(other)
-            return rule_sequence_(rules=new_rules)
+            return rule_sequence_._joined(self, rule_sequence_(rules=(other,)))
         elif isinstance(other, rule_sequence_):
-            new_rules = copy(self.rules)
-            new_rules.extend(other.rules)
-            return rule_sequence_(rules=new_rules)
+            return rule_sequence_._joined(self, other)
         else:
             return NotImplemented
 
     def __rshift__(self, other:rule_|rule_sequence_) -> production:
         if isinstance(other, rule_):
-            return production(lhs=copy(self), rhs=rule_sequence_(rules=[copy(other)]))
+            return production(lhs=self, rhs=rule_sequence_(rules=(other,)))
         elif isinstance(other, rule_sequence_):
-            return production(lhs=copy(self), rhs=copy(other))
+            return production(lhs=self, rhs=other)
         else:
             return NotImplemented
 
@@ -78,23 +109,23 @@ class production:
         self.__rhs: rule_sequence_ = rhs
         self.__utility:int = 0
         self.__reward:float|None = None
+        self.__string:str|None = None
 
     def __str__(self):
-        return f"{str(self.__lhs)}\n==>\n{str(self.__rhs)}"
+        # lhs and rhs are never changed after construction (all operators create new objects), so render only once
+        if self.__string is None:
+            self.__string = f"{str(self.__lhs)}\n==>\n{str(self.__rhs)}"
+        return self.__string
     
     def __and__(self, other:rule_|rule_sequence_) -> production:
-        if isinstance(other, rule_):
-            return production(lhs=copy(self.__lhs), rhs=self.__rhs & rule_sequence_(rules=[copy(other)]))
-        elif isinstance(other, rule_sequence_):
-            return production(lhs=copy(self.__lhs), rhs=self.__rhs & other)
+        if isinstance(other, (rule_, rule_sequence_)):
+            return production(lhs=self.__lhs, rhs=self.__rhs & other)
         else:
             return NotImplemented
 
     def __rand__(self, other:rule_|rule_sequence_) -> production:
-        if isinstance(other, rule_):
-            return production(lhs=rule_sequence_(rules=[copy(other)]) & self.__lhs, rhs=copy(self.__rhs))
-        elif isinstance(other, rule_sequence_):
-            return production(lhs=other & self.__lhs, rhs=copy(self.__rhs))
+        if isinstance(other, (rule_, rule_sequence_)):
+            return production(lhs=other & self.__lhs, rhs=self.__rhs)
         else:
             return NotImplemented
         
@@ -103,7 +134,7 @@ class production:
     
     def __add__(self, other:production|production_sequence) -> production_sequence:
         if isinstance(other, production):
-            return production_sequence(productions=[copy(self), copy(other)])
+            return production_sequence(productions=(copy(self), copy(other)))
         else:
             return NotImplemented
 
@@ -134,7 +165,9 @@ class production:
         if not self.get_name():
             self.set_name('unnamedrule' + str(model.productions._undefinedrulecounter))
 
-        model.productionstring(
+        # parses each distinct production only once, even if it is added to many models
+        add_rule_to_model(
+            model=model,
             name=self.__name if self.__name else '',
             string=str(self),
             utility=self.__utility,
@@ -144,33 +177,32 @@ class production:
         return self
     
 
-class production_sequence:
-    def __init__(self, productions:list[production]):
-        self.productions: list[production] = productions
+class production_sequence(_persistent_sequence):
+    def __init__(self, productions:Iterable[production]=()):
+        super().__init__(productions)
+
+    @property
+    def productions(self) -> tuple[production, ...]:
+        return self._flattened()
 
     def __str__(self) -> str:
         return '\n\n'.join(map(str, self.productions))
 
     def __add__(self, other:production|production_sequence) -> production_sequence:
         if isinstance(other, production):
-            new_productions = copy(self.productions)
-            new_productions.append(other)
-            return production_sequence(productions=new_productions)
+            return production_sequence._joined(self, production_sequence(productions=(other,)))
         elif isinstance(other, production_sequence):
-            new_productions = copy(self.productions)
-            new_productions.extend(other.productions)
-            return production_sequence(productions=new_productions)
+            return production_sequence._joined(self, other)
         else:
             return NotImplemented
         
     def __radd__(self, other:production|production_sequence) -> production_sequence:
         if isinstance(other, production):
-            new_productions = copy(self.productions)
-            new_productions.insert(0, other)
-            return production_sequence(productions=new_productions)
+            return production_sequence._joined(production_sequence(productions=(other,)), self)
         elif isinstance(other, production_sequence):
-            self.productions = other.productions + self.productions
-            return self
+            return production_sequence._joined(other, self)
+        else:
+            return NotImplemented
 
     def add_to_model(self, model:ACTRModel) -> production_sequence:
         for production in self.productions:
@@ -0,0 +1,95 @@
+"""
+Cache of parsed production rules, so that identical productions added to several models are only parsed once.
+
+`ACTRModel.productionstring` builds a new pyparsing grammar and parses the rule string on every call. The parse
+result only depends on the string, the chunks are created from it lazily whenever the rule is used. So the parse
+results are cached by the content hash of the rule string and shared between all models. The cache keeps at most
+MAX_PARSED_RULES results and drops the least recently used one beyond that.
+
+`add_rule_to_model` mirrors the rule generator of `ACTRModel.productionstring` in pyactr MIRRORED_PYACTR_VERSION,
+which uses pyactr's private rule conventions. With any other pyactr version it falls back to the public
+`productionstring`, so an upgrade can only make it slower, not different. Compare the mirror with the new
+`productionstring` before raising MIRRORED_PYACTR_VERSION.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+
+import pyactr
+import pyparsing
+from pyactr import ACTRModel, chunks, utilities
+
+
+MIRRORED_PYACTR_VERSION = "0.3.2"
+MAX_PARSED_RULES = 4096
+
+_RULE_GRAMMAR = None
+_PARSED_RULES: OrderedDict[bytes, pyparsing.ParseResults] = OrderedDict()
+
+
+def rule_hash(string:str) -> bytes:
+    return blake2b(string.encode(), digest_size=16).digest()
+
+
+def parse_rule(name:str, string:str) -> pyparsing.ParseResults:
+    global _RULE_GRAMMAR
+    key = rule_hash(string)
+    rule = _PARSED_RULES.get(key)
+    if rule is not None:
+        _PARSED_RULES.move_to_end(key)
+    else:
+        if _RULE_GRAMMAR is None:
+            _RULE_GRAMMAR = utilities.getrule()
+        try:
+            rule = _RULE_GRAMMAR.parse_string(string, parse_all=True)
+        except pyparsing.ParseException as e:
+            raise(utilities.ACTRError("The rule '%s' could not be parsed. The following error was observed: %s" %(name, e)))
+        _PARSED_RULES[key] = rule
+        if len(_PARSED_RULES) > MAX_PARSED_RULES:
+            _PARSED_RULES.popitem(last=False)
+    return rule
+
+
+def clear_rule_cache():
+    _PARSED_RULES.clear()
+
+
+def add_rule_to_model(model:ACTRModel, name:str, string:str, utility:int=0, reward:float|None=None):
+    """
+    Same as `model.productionstring(name, string, utility, reward)`, but with the parse result taken from the cache.
+    """
+    if pyactr.__version__ != MIRRORED_PYACTR_VERSION:
+        return model.productionstring(name, string, utility, reward)
+    rule = parse_rule(name, string)
+    # private in pyactr, therefore only read once the version is known
+    lhs_query = {v: k for k, v in utilities._LHSCONVENTIONS.items()}["query"]
+    rhs_conventions = {v: k for k, v in utilities._RHSCONVENTIONS.items()}
+    lhs, rhs = {}, {}
+    # identical to the rule generator of ACTRModel.productionstring in pyactr MIRRORED_PYACTR_VERSION
+    def func():
+        for each in rule[0]:
+            if each[0] == lhs_query:
+                lhs[each[0]+each[1]] = {x[0]:x[1] for x in each[3]}
+            else:
+                try:
+                    type_chunk, chunk_dict = chunks.createchunkdict(each[3])
+                except utilities.ACTRError as e:
+                    raise utilities.ACTRError("The rule string %s is not defined correctly; %s" %(name, e))
+                lhs[each[0]+each[1]] = chunks.makechunk("", type_chunk, **chunk_dict)
+        yield lhs
+        for each in rule[2]:
+            if each[0] == rhs_conventions["extra_test"]:
+                rhs[each[0]+each[1]] = {x[0]:x[1] for x in each[3]}
+            elif each[0] == rhs_conventions["clear"]:
+                rhs[each[0]+each[1]] = None
+            elif each[0] == rhs_conventions["execute"]:
+                rhs[each[0]+each[1]] = each[3]
+            else:
+                try:
+                    type_chunk, chunk_dict = chunks.createchunkdict(each[3])
+                except utilities.ACTRError as e:
+                    raise utilities.ACTRError("The rule string %s is not defined correctly; %s" %(name, e))
+                rhs[each[0]+each[1]] = chunks.makechunk("", type_chunk, **chunk_dict)
+        yield rhs
+    model.productions.update({name: {"rule": func, "utility": utility, "reward": reward}})
+    return model.productions[name]
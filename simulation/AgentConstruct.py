@@ -1,3 +1,4 @@
+import random
 
 
 class AgentConstruct:
@@ -22,6 +23,9 @@ class AgentConstruct:
 
         self.triggers = [{'S': {'text': 'S', 'position': (1, 1)}}]
         self.stimuli = ['S']
+        self.perception_key = None  # Game.perception_key of the last perception
+        self.rng = random.Random()  # reseeded by Simulation.agent_builder
+        self.reset_count = 0  # how often reset_simulation was called
 
     def set_actr_agent(self, actr_agent):
         self.actr_agent = actr_agent
@@ -50,12 +54,24 @@ class AgentConstruct:
             for i, agent in enumerate(agent_list)
         }
 
+        # Reverse lookup agent -> letter, used when building the visual stimuli
+        self.agent_symbols = {info["agent"]: sym for sym, info in self.agent_dictionary.items()}
+
     def get_agent_dictionary(self):
         return self.agent_dictionary
 
     # Fills the visual buffer with new stimuli, based on the environments condition.
+    # The previous stimuli are reused as long as nothing in the field of view has changed.
+    # The GUI is not notified here: step_once notifies it once per step, the other modes render published snapshots
+    # (run_headless may run in a worker thread, which must not touch Tk).
     def update_stimulus(self):
-        if self.middleman.experiment_environment:
+        game = self.middleman.experiment_environment
+        if game:
+            perception_key = game.perception_key(self)
+            if perception_key == self.perception_key:
+                return
+            self.perception_key = perception_key
+
             new_triggers, new_stimuli = self.middleman.get_agent_stimulus(self)
             """
             self.simulation._Simulation__env.triggers = new_triggers
@@ -66,8 +82,6 @@ class AgentConstruct:
             self.triggers = new_triggers
             self.stimuli = new_stimuli
 
-            self.middleman.simulation.notify_gui()
-
     def set_actr_construct(self, actr_construct):
         self.actr_construct = actr_construct
 
@@ -92,17 +106,8 @@ class AgentConstruct:
             default_goal = self.actr_construct.initial_goal
         first_goal = next(iter(self.actr_agent.goals.values()))  # The second one is imaginal
         first_goal.add(default_goal)
-        new_simulation = self.actr_agent.simulation(
-            realtime=self.realtime,
-            environment_process=self.actr_environment.environment_process,
-            stimuli=self.stimuli,
-            triggers=self.triggers,
-            times=0.1,
-            gui=False,
-            trace=False
-        )
-
-        self.simulation = new_simulation
+        self.reset_count += 1
+        self.set_simulation()
 
     # An empty schedule would crash the whole simulation. Reset the agent instead, so he can reevaluate.
     def handle_empty_schedule(self):
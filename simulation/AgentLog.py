@@ -0,0 +1,128 @@
+import bisect
+from collections import deque
+
+
+class AgentLog:
+    """
+    Append-only Index der Log-Einträge eines Agenten, wird vom BastiTracer gepflegt.
+    Zeilen (Typen) und Spalten (Zeitstempel) sind vorberechnet, damit der StepLogWindow nur neue Einträge zeichnen muss.
+
+    Attributes:
+        indexes (deque): Absolute Tracer-Indizes der gehaltenen Einträge dieses Agenten
+        timestamps (deque): Zeitstempel der gehaltenen Einträge, parallel zu indexes
+        entry_types (deque): Typen der gehaltenen Einträge, parallel zu indexes
+        start (int): Nummer des ältesten gehaltenen Eintrags dieses Agenten
+        count (int): Anzahl aller jemals angehängten Einträge, zugleich die Nummer des nächsten Eintrags
+        types (list): Sortierte Typen, die Position ist die Zeile
+        rows (dict): Typ -> Zeile
+        times (deque): Gehaltene Zeitstempel in Spaltenreihenfolge
+        columns (dict): Zeitstempel -> absolute Spalte
+        time_entries (dict): Zeitstempel -> Nummern der Einträge in dieser Spalte
+        first_column (int): Absolute Spalte von times[0]
+        max_lines (int): Höchste Zeilenzahl eines Event-Texts, bestimmt die Zellhöhe
+        layout_version (int): Wird erhöht, wenn sich Zeilen, Spalten oder die Zellhöhe verschieben
+    """
+
+    def __init__(self):
+        self.indexes = deque()
+        self.timestamps = deque()
+        self.entry_types = deque()
+        self.start = 0
+        self.count = 0
+
+        self.types = []
+        self.rows = {}
+        self._type_counts = {}
+
+        self.times = deque()
+        self.columns = {}
+        self.time_entries = {}
+        self.first_column = 0
+
+        self.max_lines = 1
+        self.layout_version = 0
+
+    def __len__(self):
+        return self.count - self.start
+
+    def append(self, index, timestamp, typ, event):
+        """Hängt einen Eintrag an und aktualisiert Zeilen, Spalten und Zellhöhe."""
+        self.indexes.append(index)
+        self.timestamps.append(timestamp)
+        self.entry_types.append(typ)
+        self.count += 1
+
+        if typ in self._type_counts:
+            self._type_counts[typ] += 1
+        else:
+            self._type_counts[typ] = 1
+            bisect.insort(self.types, typ)
+            self._renumber_rows()
+
+        if timestamp in self.time_entries:
+            self.time_entries[timestamp].append(self.count - 1)
+        else:
+            self.time_entries[timestamp] = [self.count - 1]
+            if not self.times or timestamp > self.times[-1]:
+                self.columns[timestamp] = self.first_column + len(self.times)
+                self.times.append(timestamp)
+            else:
+                # Zeit läuft rückwärts (z.B. nach einem Reset), die Spalten dahinter verschieben sich
+                times = sorted(self.times)
+                bisect.insort(times, timestamp)
+                self.times = deque(times)
+                self._renumber_columns()
+
+        if event is not None:
+            lines = str(event).count('\n') + 1
+            if lines > self.max_lines:
+                self.max_lines = lines
+                self.layout_version += 1
+
+    def drop_oldest(self):
+        """Entfernt den ältesten Eintrag, nachdem ihn der Ringpuffer des Tracers verdrängt hat."""
+        self.indexes.popleft()
+        timestamp = self.timestamps.popleft()
+        typ = self.entry_types.popleft()
+        self.start += 1
+
+        self._type_counts[typ] -= 1
+        if not self._type_counts[typ]:
+            del self._type_counts[typ]
+            self.types.remove(typ)
+            self._renumber_rows()
+
+        entries = self.time_entries[timestamp]
+        entries.pop(0)
+        if not entries:
+            del self.time_entries[timestamp]
+            if timestamp == self.times[0]:
+                # Absolute Spalten bleiben stabil, nur der Anfang wandert
+                self.times.popleft()
+                del self.columns[timestamp]
+                self.first_column += 1
+            else:
+                self.times.remove(timestamp)
+                self._renumber_columns()
+
+    def entry(self, number):
+        """Gibt (Tracer-Index, Zeile, Spalte) des Eintrags mit der Nummer zurück."""
+        i = number - self.start
+        return self.indexes[i], self.rows[self.entry_types[i]], self.columns[self.timestamps[i]]
+
+    def column_entries(self, column):
+        """Gibt die Nummern der Einträge in der (absoluten) Spalte zurück."""
+        return self.time_entries[self.times[column - self.first_column]]
+
+    @property
+    def last_column(self):
+        """Absolute Spalte hinter der letzten gehaltenen Spalte."""
+        return self.first_column + len(self.times)
+
+    def _renumber_rows(self):
+        self.rows = {typ: row for row, typ in enumerate(self.types)}
+        self.layout_version += 1
+
+    def _renumber_columns(self):
+        self.columns = {timestamp: self.first_column + i for i, timestamp in enumerate(self.times)}
+        self.layout_version += 1
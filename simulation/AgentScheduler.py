@@ -0,0 +1,80 @@
+import heapq
+from itertools import count
+
+
+class AgentScheduler:
+    """
+    Priority queue of agents keyed on their actr_time, so the next agent is found without sorting the agent list.
+
+    Ties are broken like the stable sort of the agent list, which the scheduler replaces: an agent that is rescheduled
+    goes before every other agent with the same actr_time (it was at the front of the list when it stepped), all
+    others keep their order, and initially the agents are in the order in which they were added.
+    Rescheduled or removed agents leave their old heap entry behind, which is skipped lazily. Because cognition time
+    only increases, an outdated entry always sits too early in the heap and is corrected as soon as it reaches the top.
+
+    Attributes:
+        heap (list): Entries [actr_time, rank, agent], agent is None for stale entries
+        entries (dict): Current heap entry per agent
+        added (count): Ranks for added agents, increasing, so they line up behind each other
+        stepped (count): Ranks for rescheduled agents, negated, so each goes before all previous ranks
+    """
+
+    def __init__(self, agents=()):
+        self.heap = []
+        self.entries = {}
+        self.added = count()
+        self.stepped = count(1)
+        for agent in agents:
+            self.add(agent)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, agent):
+        return agent in self.entries
+
+    def add(self, agent):
+        """Schedules the agent behind all agents with the same actr_time, like appending it to the agent list."""
+        self._push(agent, next(self.added))
+
+    def reschedule(self, agent):
+        """Reinserts the agent with its current actr_time in O(log n)."""
+        old_entry = self.entries.get(agent)
+        if old_entry is not None and old_entry[0] == agent.actr_time:
+            return
+        self._push(agent, -next(self.stepped))
+
+    def _push(self, agent, rank):
+        old_entry = self.entries.get(agent)
+        if old_entry is not None:
+            old_entry[2] = None
+        entry = [agent.actr_time, rank, agent]
+        self.entries[agent] = entry
+        heapq.heappush(self.heap, entry)
+
+    def remove(self, agent):
+        entry = self.entries.pop(agent, None)
+        if entry is not None:
+            entry[2] = None
+
+    def ordered(self):
+        """
+        Returns:
+            list: The scheduled agents in the order in which they would step, e.g. to rebuild the scheduler with add
+        """
+        return [entry[2] for entry in sorted(self.entries.values(), key=lambda entry: (entry[0], entry[1]))]
+
+    def peek(self):
+        """
+        Returns:
+            AgentConstruct: The agent with the lowest actr_time or None if no agent is scheduled
+        """
+        while self.heap:
+            actr_time, _, agent = self.heap[0]
+            if agent is None:
+                heapq.heappop(self.heap)
+            elif actr_time != agent.actr_time:
+                self.reschedule(agent)
+            else:
+                return agent
+        return None
@@ -0,0 +1,54 @@
+import importlib
+
+
+class AgentTemplate:
+    """
+    Resolved classes of one agent type. The modules are imported on the first resolve, afterwards every spawn
+    only instantiates the cached classes.
+
+    Attributes:
+        name (str): Agent type name as used in Simulation.agent_type_config
+        runner_spec: Runner class or "module:Class" string
+        adapter_spec: Adapter class or "module:Class" string
+        adapter_takes_runner (bool): If True, the adapter is created with (actr_environment, runner)
+        runner_class (type): Resolved runner class, None until resolved
+        adapter_class (type): Resolved adapter class, None until resolved
+    """
+
+    def __init__(self, name, runner_spec, adapter_spec, adapter_takes_runner=False):
+        self.name = name
+        self.runner_spec = runner_spec
+        self.adapter_spec = adapter_spec
+        self.adapter_takes_runner = adapter_takes_runner
+        self.runner_class = None
+        self.adapter_class = None
+
+    @staticmethod
+    def load(spec):
+        """Imports "module:Class" specs, classes are returned as they are."""
+        if not isinstance(spec, str):
+            return spec
+        module_name, _, attribute = spec.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)
+
+    def resolve(self):
+        if self.runner_class is None or self.adapter_class is None:
+            # Erst beide laden, damit ein fehlgeschlagener Import keine halb aufgelöste Vorlage hinterlässt
+            runner_class = self.load(self.runner_spec)
+            adapter_class = self.load(self.adapter_spec)
+            self.runner_class, self.adapter_class = runner_class, adapter_class
+        return self
+
+    def spawn(self, actr_environment, agent_id_list):
+        """
+        Returns:
+            tuple: (runner, actr_agent, adapter) of a new agent
+        """
+        self.resolve()
+        runner = self.runner_class(actr_environment)
+        actr_agent = runner.build_agent(agent_id_list)
+        if self.adapter_takes_runner:
+            adapter = self.adapter_class(actr_environment, runner)
+        else:
+            adapter = self.adapter_class(actr_environment)
+        return runner, actr_agent, adapter
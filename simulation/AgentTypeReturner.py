@@ -1,79 +1,55 @@
-from agents.Beedrill import Beedrill
-from agents.BeedrillAdapter import BeedrillAdapter
-from agents.Dakrai import Dakrai
-from agents.DakraiAdapter import DakraiAdapter
-from agents.Deoxis import Deoxis
-from agents.DeoxisAdapter import DeoxisAdapter
-from agents.Imposter import Imposter
-from agents.ImposterAdapter import ImposterAdapter
-from agents.Mew import Mew
-from agents.MewAdapter import MewAdapter
-from agents.Pinsir import Pinsir
-from agents.PinsirAdapter import PinsirAdapter
-from agents.Victreebel import Victreebel
-from agents.VictreebelAdapter import VictreebelAdapter
-from agents.CharmanderProj import Charmander
-from agents.CharmanderProjAdapter import CharmanderAdapter
-from agents.Chatot import Chatot
-from agents.ChatotAdapter import ChatotAdapter
-from agents.Gengar import Gengar
-from agents.GengarAdapter import GengarAdapter
-from agents.Hoothoot import Hoothoot
-from agents.HoothootAdapter import HoothootAdapter
+from simulation.AgentTemplate import AgentTemplate
 
+# Agent type name -> AgentTemplate. The agent modules are only imported when a type is requested,
+# so e.g. pandas (CharmanderProjAdapter) is only loaded if a Charmander is configured.
+AGENT_TYPES = {}
 
-# Only to avoid overloading the simulation. Returns the Agent object needed.
-class AgentTypeReturner:
-    def __init__(self):
-        pass
-
-    # Create an agent object based on the type
-    def return_agent_type(self, name, actr_environment, agent_id_list):
-        if name == "Human":
-            return None
 
-        elif name == "Mew":
-            runner = Mew(actr_environment)
-            return runner, runner.build_agent(agent_id_list), MewAdapter(actr_environment)
+def register_agent_type(name, runner, adapter, adapter_takes_runner=False):
+    """
+    Registers an agent type. runner and adapter are classes or "module:Class" strings, which are imported lazily.
+    Registering an existing name replaces it.
+    """
+    AGENT_TYPES[name] = AgentTemplate(name, runner, adapter, adapter_takes_runner)
 
-        elif name == "Beedrill":
-            runner = Beedrill(actr_environment)
-            return runner, runner.build_agent(agent_id_list), BeedrillAdapter(actr_environment)
 
-        elif name == "Dakrai":
-            runner = Dakrai(actr_environment)
-            return runner, runner.build_agent(agent_id_list), DakraiAdapter(actr_environment)
+def agent_type(name, adapter, adapter_takes_runner=False):
+    """
+    Decorator for runner classes, e.g. for agents that live outside the agents package:
 
-        elif name == "Deoxis":
-            runner = Deoxis(actr_environment)
-            return runner, runner.build_agent(agent_id_list), DeoxisAdapter(actr_environment)
+        @agent_type("Pikachu", adapter="my_agents.PikachuAdapter:PikachuAdapter")
+        class Pikachu: ...
+    """
+    def decorator(runner_class):
+        register_agent_type(name, runner_class, adapter, adapter_takes_runner)
+        return runner_class
+    return decorator
 
-        elif name == "Pinsir":
-            runner = Pinsir(actr_environment)
-            return runner, runner.build_agent(agent_id_list), PinsirAdapter(actr_environment)
 
-        elif name == "Victreebel":
-            runner = Victreebel(actr_environment)
-            return runner, runner.build_agent(agent_id_list), VictreebelAdapter(actr_environment)
+register_agent_type("Mew", "agents.Mew:Mew", "agents.MewAdapter:MewAdapter")
+register_agent_type("Beedrill", "agents.Beedrill:Beedrill", "agents.BeedrillAdapter:BeedrillAdapter")
+register_agent_type("Dakrai", "agents.Dakrai:Dakrai", "agents.DakraiAdapter:DakraiAdapter")
+register_agent_type("Deoxis", "agents.Deoxis:Deoxis", "agents.DeoxisAdapter:DeoxisAdapter")
+register_agent_type("Pinsir", "agents.Pinsir:Pinsir", "agents.PinsirAdapter:PinsirAdapter")
+register_agent_type("Victreebel", "agents.Victreebel:Victreebel", "agents.VictreebelAdapter:VictreebelAdapter")
+register_agent_type("Imposter", "agents.Imposter:Imposter", "agents.ImposterAdapter:ImposterAdapter")
+register_agent_type("Charmander", "agents.CharmanderProj:Charmander", "agents.CharmanderProjAdapter:CharmanderAdapter")
+register_agent_type("Chatot", "agents.Chatot:Chatot", "agents.ChatotAdapter:ChatotAdapter")
+register_agent_type("Gengar", "agents.Gengar:Gengar", "agents.GengarAdapter:GengarAdapter", adapter_takes_runner=True)
+register_agent_type("Hoothoot", "agents.Hoothoot:Hoothoot", "agents.HoothootAdapter:HoothootAdapter")
 
-        elif name == "Imposter":
-            runner = Imposter(actr_environment)
-            return runner, runner.build_agent(agent_id_list), ImposterAdapter(actr_environment)
 
-        elif name == "Charmander":
-            runner = Charmander(actr_environment)
-            return runner, runner.build_agent(agent_id_list), CharmanderAdapter(actr_environment)
-
-        elif name == "Chatot":
-            runner = Chatot(actr_environment)
-            return runner, runner.build_agent(agent_id_list), ChatotAdapter(actr_environment)
-        elif name == "Gengar":
-            runner = Gengar(actr_environment)
-            return runner, runner.build_agent(agent_id_list), GengarAdapter(actr_environment, runner)
+# Only to avoid overloading the simulation. Returns the Agent object needed.
+class AgentTypeReturner:
+    def __init__(self):
+        pass
 
-        elif name == "Hoothoot":
-            runner = Hoothoot(actr_environment)
-            return runner, runner.build_agent(agent_id_list), HoothootAdapter(actr_environment)
+    # Create an agent object based on the type
+    def return_agent_type(self, name, actr_environment, agent_id_list):
+        if name == "Human":
+            return None
 
-        else:
-            raise ValueError(f"Unknown Agent .py Type: {name}")
\ No newline at end of file
+        template = AGENT_TYPES.get(name)
+        if template is None:
+            raise ValueError(f"Unknown Agent .py Type: {name}")
+        return template.spawn(actr_environment, agent_id_list)
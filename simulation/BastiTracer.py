@@ -1,18 +1,62 @@
-import datetime
+import csv
+from array import array
+from simulation.AgentLog import AgentLog
+
 
 class BastiTracer:
-    def __init__(self):
-        # Hier speichern wir alle Log-Einträge
-        # Jeder Eintrag ist ein Dict mit keys: timestamp, type, event, agent_name
-        self.records = []
+    """
+    Sammelt die ACT-R Events aller Agenten spaltenweise statt als Liste von Dicts.
+    Agentennamen, Typen und Event-Texte werden interniert, pro Eintrag bleiben nur ein Zeitstempel und drei Ids.
+    Event-Texte werden pro gehaltenem Eintrag gezählt und freigegeben, sobald der Ringpuffer den letzten Eintrag mit
+    diesem Text überschreibt, so bleibt der Speicher mit capacity auch bei immer neuen Texten begrenzt.
+
+    Attributes:
+        capacity (int): Maximale Anzahl gehaltener Einträge (Ringpuffer), None = unbegrenzt
+        spill_path (str): CSV-Datei, in die aus dem Ringpuffer verdrängte Einträge geschrieben werden, None = verwerfen
+        known_agents (set): Namen aller Agenten, die schon geloggt wurden
+        count (int): Anzahl aller jemals geloggten Einträge, zugleich der Index des nächsten Eintrags
+        start (int): Index des ältesten noch gehaltenen Eintrags
+        timestamps (array): Spalte der Zeitstempel
+        type_ids (array): Spalte der Typ-Ids, siehe types
+        event_ids (array): Spalte der Event-Ids, siehe events (0 = kein Event)
+        agent_ids (array): Spalte der Agenten-Ids, siehe agent_names
+        events (list): Internierte Event-Texte nach Id, freigegebene Ids sind None bis zur Wiederverwendung
+        agent_logs (dict): Agentenname -> AgentLog, die Einträge pro Agent für den StepLogWindow
+    """
+
+    def __init__(self, capacity=None, spill_path=None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._spill_file = None
+        self._spill_writer = None
+
         # Damit wir neue Agents erkennen
         self.known_agents = set()
 
+        self.count = 0
+        self.start = 0
+        self.timestamps = array('d')
+        self.type_ids = array('I')
+        self.event_ids = array('I')
+        self.agent_ids = array('I')
+
+        # Internierte Werte
+        self.types = []
+        self._type_index = {}
+        self.events = [None]
+        self._event_index = {None: 0}
+        self._event_refs = array('I', [0])  # Anzahl gehaltener Einträge pro Event-Id
+        self._free_event_ids = []  # Ids freigegebener Event-Texte, werden wiederverwendet
+        self.agent_names = []
+        self._agent_index = {}
+
+        self.agent_logs = {}
+
     def trace(self, agent, event):
         """
         Legt einen Log-Eintrag an:
         - timestamp: der aktuelle Simulationszeitpunkt (agent.actr_time)
-        - type: der Agenten-Typ (agent.actr_agent_type_name)
+        - type: der ACT-R Buffer/Modul des Events (event[1])
         - event: die aktuelle Event-Beschreibung aus ACT-R
         - agent_name: agent.name (falls du mehrere Instanzen desselben Typs differenzieren willst)
         Außerdem wird, falls dieser Agent noch unbekannt ist, zuerst ein 'agent_added'-Eintrag erzeugt.
@@ -23,21 +67,115 @@ class BastiTracer:
         # Neuer Agent?
         if name not in self.known_agents:
             self.known_agents.add(name)
-            self.records.append({
-                "timestamp": ts,
-                "type": "agent_added",
-                "event": None,
-                "agent_name": name
-            })
+            self._append(ts, "agent_added", None, name)
 
         # Den eigentlichen Schritt loggen
-        self.records.append({
-            "timestamp": ts,
-            "type": event[1],
-            "event": event[2],
-            "agent_name": name
-        })
+        self._append(ts, event[1], event[2], name)
+
+    @staticmethod
+    def _intern(value, values, index):
+        i = index.get(value)
+        if i is None:
+            i = len(values)
+            values.append(value)
+            index[value] = i
+        return i
+
+    def _intern_event(self, event):
+        i = self._event_index.get(event)
+        if i is None:
+            if self._free_event_ids:
+                i = self._free_event_ids.pop()
+                self.events[i] = event
+            else:
+                i = len(self.events)
+                self.events.append(event)
+                self._event_refs.append(0)
+            self._event_index[event] = i
+        self._event_refs[i] += 1
+        return i
+
+    def _release_event(self, i):
+        self._event_refs[i] -= 1
+        if self._event_refs[i] == 0 and i != 0:
+            del self._event_index[self.events[i]]
+            self.events[i] = None
+            self._free_event_ids.append(i)
+
+    def _append(self, ts, typ, event, name):
+        type_id = self._intern(typ, self.types, self._type_index)
+        event_id = self._intern_event(event)
+        agent_id = self._intern(name, self.agent_names, self._agent_index)
+
+        if self.capacity is None or len(self.timestamps) < self.capacity:
+            self.timestamps.append(ts)
+            self.type_ids.append(type_id)
+            self.event_ids.append(event_id)
+            self.agent_ids.append(agent_id)
+        else:
+            # Ringpuffer voll: ältesten Eintrag überschreiben
+            slot = self.count % self.capacity
+            if self.spill_path is not None:
+                self._spill(self._record_at(slot))
+            self.agent_logs[self.agent_names[self.agent_ids[slot]]].drop_oldest()
+            self._release_event(self.event_ids[slot])
+            self.timestamps[slot] = ts
+            self.type_ids[slot] = type_id
+            self.event_ids[slot] = event_id
+            self.agent_ids[slot] = agent_id
+            self.start += 1
+
+        agent_log = self.agent_logs.get(name)
+        if agent_log is None:
+            agent_log = self.agent_logs[name] = AgentLog()
+        agent_log.append(self.count, ts, typ, event)
+        self.count += 1
+
+    def _spill(self, record):
+        if self._spill_writer is None:
+            self._spill_file = open(self.spill_path, 'a', newline='', encoding='utf-8')
+            self._spill_writer = csv.writer(self._spill_file)
+        self._spill_writer.writerow((record["timestamp"], record["type"], record["event"], record["agent_name"]))
+
+    def _slot(self, index):
+        return index if self.capacity is None else index % self.capacity
+
+    def _record_at(self, slot):
+        return {
+            "timestamp": self.timestamps[slot],
+            "type": self.types[self.type_ids[slot]],
+            "event": self.events[self.event_ids[slot]],
+            "agent_name": self.agent_names[self.agent_ids[slot]]
+        }
+
+    def record(self, index):
+        """Gibt den Eintrag mit dem (absoluten) Index als Dict zurück."""
+        if not self.start <= index < self.count:
+            raise IndexError(f"Log-Eintrag {index} wird nicht mehr gehalten")
+        return self._record_at(self._slot(index))
+
+    def records_since(self, index):
+        """Gibt alle noch gehaltenen Einträge ab dem (absoluten) Index als Dicts zurück."""
+        return [self._record_at(self._slot(i)) for i in range(max(index, self.start), self.count)]
+
+    def agent_log(self, agent_name):
+        """Gibt den AgentLog des Agenten zurück, None falls er noch nichts geloggt hat."""
+        return self.agent_logs.get(agent_name)
+
+    @property
+    def records(self):
+        return self.records_since(self.start)
+
+    def __len__(self):
+        return self.count - self.start
 
     def get_logs(self):
-        """Gibt die gesammelten Log-Einträge zurück."""
+        """Gibt die gehaltenen Log-Einträge zurück (ältester zuerst)."""
         return self.records
+
+    def close(self):
+        """Schließt die Spill-Datei, falls eine geöffnet wurde."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            self._spill_writer = None
@@ -0,0 +1,188 @@
+"""
+Runs many independent headless episodes in parallel, e.g. for parameter sweeps.
+Every episode builds its own ACT-R environment, Middleman and Game inside a worker process.
+
+A configuration is a dict with the keys
+    agent_type_config (dict): Same format as Simulation.agent_type_config
+    los (int): Line of sight of the agents
+    difficulty (str): ImposterAdapter.difficulty ("easy", "medium", "hard")
+    level_type (str): Level name for the LevelBuilder, None for a random level
+    seed (int): Seed of the episode, see Simulation.seed
+Missing keys keep the defaults of Simulation.
+
+Continuations fork many episodes from one mid-game state: warm_up runs the shared beginning once and returns a
+snapshot (see Simulation.snapshot), iter_continuations restores it in every worker and reseeds it per branch.
+"""
+
+import contextlib
+import copy
+import io
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from simulation.Simulation import Simulation
+from simulation.SimulationResult import SimulationResult
+from simulation.BastiTracer import BastiTracer
+
+
+def build_grid(agent_type_configs, los_values=(3,), difficulties=("easy",), level_types=("Agent Project",), seeds=(0,)):
+    """
+    Cartesian product of all configuration axes.
+    """
+    return [
+        {"agent_type_config": agent_type_config, "los": los, "difficulty": difficulty,
+         "level_type": level_type, "seed": seed}
+        for agent_type_config, los, difficulty, level_type, seed
+        in itertools.product(agent_type_configs, los_values, difficulties, level_types, seeds)
+    ]
+
+
+def configure_simulation(simulation, config):
+    """
+    Applies a configuration dict onto a fresh Simulation before its episode is built.
+    """
+    if "agent_type_config" in config:
+        simulation.agent_type_config = copy.deepcopy(config["agent_type_config"])
+    if "seed" in config:
+        simulation.seed = config["seed"]
+    if "los" in config:
+        simulation.los = config["los"]
+    if "level_type" in config:
+        simulation.level_type = config["level_type"]
+    if "difficulty" in config and "Imposter" in simulation.agent_type_config:
+        imposter_config = simulation.agent_type_config["Imposter"]
+        imposter_config.setdefault("adapter_settings", {})["difficulty"] = config["difficulty"]
+
+
+def _run_to_summary(simulation, summary, prepare=None, max_sim_time=None, max_steps=None, quiet=True):
+    """
+    Runs the episode of simulation headless and adds its result to summary. prepare is called first, inside the same
+    error handling. An exception doesn't escape to the pool, the summary then has reason "error", the steps done so
+    far and the repr of the exception under "error".
+    """
+    # Die Agenten loggen sehr viel auf stdout, was bei vielen Workern nur bremst
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    error = None
+    with output:
+        try:
+            if prepare is not None:
+                prepare()
+            result = simulation.run_headless(max_sim_time=max_sim_time, max_steps=max_steps)
+        except Exception as e:
+            game = simulation.game_environment
+            result = SimulationResult(
+                None,
+                "error",
+                simulation.global_sim_time,
+                simulation.step_count,
+                game.sabotage_count if game is not None else 0,
+                game.repair_count if game is not None else 0,
+                simulation.seed,
+                {agent.name: agent.reset_count for agent in simulation.all_agents}
+            )
+            error = repr(e)
+
+    summary.update(result.to_dict())
+    if error is not None:
+        summary["error"] = error
+    return summary
+
+
+def run_episode(config, max_sim_time=None, max_steps=None, quiet=True):
+    """
+    Runs one episode in the current process and returns a compact summary dict.
+    Top-level function, so it can be pickled and sent to a worker process.
+    """
+    simulation = Simulation(BastiTracer(), headless=True)
+    configure_simulation(simulation, config)
+    summary = {key: value for key, value in config.items() if key != "agent_type_config"}
+    return _run_to_summary(simulation, summary, None, max_sim_time, max_steps, quiet)
+
+
+def warm_up(config, max_sim_time=None, max_steps=None, quiet=True):
+    """
+    Runs the beginning of an episode once and returns its snapshot for run_continuation.
+    """
+    simulation = Simulation(BastiTracer(), headless=True)
+    configure_simulation(simulation, config)
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        simulation.run_headless(max_sim_time=max_sim_time, max_steps=max_steps)
+    return simulation.snapshot()
+
+
+def run_continuation(state, branch_seed=None, max_sim_time=None, max_steps=None, quiet=True):
+    """
+    Restores a snapshot in the current process, reseeds it with branch_seed (None keeps the snapshot's random state)
+    and runs it to the end. Returns a compact summary dict like run_episode, also if the snapshot can't be restored.
+    """
+    simulation = Simulation(BastiTracer(), headless=True)
+
+    def prepare():
+        simulation.restore(state)
+        if branch_seed is not None:
+            simulation.branch(branch_seed)
+
+    return _run_to_summary(simulation, {"branch_seed": branch_seed}, prepare, max_sim_time, max_steps, quiet)
+
+
+def iter_continuations(state, branch_seeds, max_workers=None, max_sim_time=None, max_steps=None):
+    """
+    Fans one snapshot out to a process pool, one continuation per branch seed, and yields (index, summary)
+    as soon as a continuation finishes. The index refers to the position of the seed in branch_seeds.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_continuation, state, branch_seed, max_sim_time, max_steps): index
+            for index, branch_seed in enumerate(branch_seeds)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_continuations(state, branch_seeds, max_workers=None, max_sim_time=None, max_steps=None):
+    """
+    Runs all continuations and returns their summaries in the order of branch_seeds.
+    """
+    branch_seeds = list(branch_seeds)
+    summaries = [None] * len(branch_seeds)
+    for index, summary in iter_continuations(state, branch_seeds, max_workers, max_sim_time, max_steps):
+        summaries[index] = summary
+    return summaries
+
+
+def iter_batch(configs, max_workers=None, max_sim_time=None, max_steps=None):
+    """
+    Fans the episodes out to a process pool and yields (index, summary) as soon as an episode finishes.
+    The index refers to the position of the configuration in configs.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_episode, config, max_sim_time, max_steps): index
+            for index, config in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_batch(configs, max_workers=None, max_sim_time=None, max_steps=None):
+    """
+    Runs all episodes and returns their summaries in the order of configs.
+    """
+    summaries = [None] * len(configs)
+    for index, summary in iter_batch(configs, max_workers, max_sim_time, max_steps):
+        summaries[index] = summary
+    return summaries
+
+
+if __name__ == '__main__':
+    # Beispiel: python -m simulation.BatchRunner
+    grid = build_grid(
+        agent_type_configs=[{
+            "Imposter": {"count": 1, "pokedex_id": 647, "print_agent_actions": False},
+            "Chatot": {"count": 1, "pokedex_id": 441, "print_agent_actions": False}
+        }],
+        difficulties=("easy", "medium", "hard"),
+        seeds=range(4)
+    )
+    for index, summary in iter_batch(grid, max_sim_time=300):
+        print(index, summary)
@@ -0,0 +1,349 @@
+"""
+Captures the state of a running episode as compact bytes and applies it onto a Simulation again, e.g. to fork
+many continuations of one mid-game state. Used by Simulation.snapshot() and Simulation.restore().
+
+The pyactr simulations (simpy processes) cannot be serialized. The snapshot holds the data they are built from
+instead: buffers, declarative memories, production utilities, model parameters, perception and the adapters'
+attributes. restore() rebuilds the episode from its configuration and seed, overwrites that state and starts a fresh
+pyactr simulation per agent, just like AgentConstruct.reset_simulation does. The tracer log is not part of the snapshot.
+
+pyactr keeps its chunk types in a registry that is global to the process and grows while agents run. The snapshot
+stores that registry, restore() merges it into the registry of the process without removing anything other
+Simulations may use, and every chunk is rebuilt with exactly the slots it had.
+"""
+
+import collections
+import io
+import pickle
+import random
+import zlib
+import numpy as np
+from pyactr import chunks, utilities
+from simulation.AgentScheduler import AgentScheduler
+
+FORMAT_VERSION = 3
+
+# Simulation-Attribute, aus denen build_episode dieselbe Episode wieder aufbaut
+CONFIG_ATTRIBUTES = (
+    "level_type", "width", "height", "food_amount", "wall_density", "los", "print_agent_actions", "seed",
+    "agent_type_config"
+)
+
+# Adapter-Attribute, die restore nicht überschreibt
+SKIPPED_ADAPTER_ATTRIBUTES = ("agent_construct",)
+
+# Buffer-Attribute, die auf geteilte Objekte zeigen (Gedächtnis, model_parameters des Modells)
+SKIPPED_BUFFER_ATTRIBUTES = ("_Buffer__dm", "model_parameters")
+
+# Wahrnehmung des Agenten, mit der die neue pyactr Simulation startet
+PERCEPTION_ATTRIBUTES = ("triggers", "stimuli", "visual_stimuli")
+
+
+def _chunk_tuple(typename, fields, defaults):
+    try:
+        return collections.namedtuple(typename, fields, defaults=defaults)
+    except TypeError:
+        # wie pyactr.chunks.chunktype: unbrauchbare Defaults werden weggelassen
+        return collections.namedtuple(typename, fields)
+
+
+def _capture_chunk_types():
+    """
+    Returns:
+        dict: chunk type name -> (slot names, defaults) of every type in pyactr's registry
+    """
+    return {
+        typename: (chunk_type._fields, tuple(chunk_type._field_defaults.values()))
+        for typename, chunk_type in chunks.Chunk._chunktypes.items()
+    }
+
+
+def _restore_chunk_types(chunk_types):
+    """
+    Merges the captured chunk types into pyactr's registry. The registry is shared by every Simulation in the process,
+    so types are only added or extended, like pyactr extends them itself: a type that already has all captured slots
+    is kept, a type with fewer slots is replaced by the captured one, otherwise the slots are united.
+    """
+    registry = chunks.Chunk._chunktypes
+    for typename, (fields, defaults) in chunk_types.items():
+        chunk_type = registry.get(typename)
+        if chunk_type is None or set(chunk_type._fields) < set(fields):
+            registry[typename] = _chunk_tuple(typename, fields, defaults)
+        elif not set(fields) <= set(chunk_type._fields):
+            registry[typename] = _chunk_tuple(typename, tuple(sorted(set(chunk_type._fields) | set(fields))), None)
+
+
+def _make_chunk(cls, typename, fields, values, boundvars):
+    # Unterklassen wie AdvChunk behalten ihre Klasse (und damit ihr __str__)
+    chunk = cls.__new__(cls)
+    chunks.Chunk.__init__(chunk, typename)
+    # Slots des Chunks selbst, nicht die des (inzwischen evtl. erweiterten) Chunktyps
+    if chunk.actrchunk._fields != fields:
+        chunk.actrchunk = _chunk_tuple(typename, fields, None)(*values)
+    else:
+        chunk.actrchunk = chunk.actrchunk._make(values)
+    chunk.boundvars = boundvars
+    return chunk
+
+
+def _make_varval(values, variables, negvalues, negvariables):
+    return utilities.VarvalClass(values, variables, negvalues, negvariables)
+
+
+def _make_empty_value():
+    return chunks.Chunk.EmptyValue()
+
+
+def _references(simulation):
+    """
+    Objekte, die nicht mitserialisiert, sondern beim Wiederherstellen aus der neu gebauten Episode genommen werden.
+
+    Returns:
+        dict: key -> object
+    """
+    references = {
+        ("simulation",): simulation,
+        ("middleman",): simulation.middleman,
+        ("environment",): simulation.actr_environment,
+        ("game",): simulation.game_environment,
+    }
+    for index, agent in enumerate(simulation.all_agents):
+        references[("agent", index)] = agent
+    for index, location in enumerate(simulation.game_environment.world.locations):
+        references[("location", index)] = location
+    return references
+
+
+class EpisodePickler(pickle.Pickler):
+    """
+    Pickler, der Agenten, Locations und die Umgebung nur als Referenz schreibt und pyactr Chunks,
+    deren Chunktypen dynamisch erzeugte namedtuples sind, über ihren Typnamen und ihre Slots.
+    """
+
+    def __init__(self, file, references):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.reference_keys = {id(obj): key for key, obj in references.items()}
+
+    def persistent_id(self, obj):
+        return self.reference_keys.get(id(obj))
+
+    def reducer_override(self, obj):
+        if isinstance(obj, chunks.Chunk):
+            actrchunk = obj.actrchunk
+            return _make_chunk, (type(obj), obj.typename, actrchunk._fields, tuple(actrchunk), obj.boundvars)
+        if isinstance(obj, utilities.VarvalClass):
+            return _make_varval, tuple(obj)
+        if isinstance(obj, chunks.Chunk.EmptyValue):
+            return _make_empty_value, ()
+        return NotImplemented
+
+
+class EpisodeUnpickler(pickle.Unpickler):
+    """Gegenstück zu EpisodePickler, löst die Referenzen in der neu gebauten Episode auf."""
+
+    def __init__(self, file, references):
+        super().__init__(file)
+        self.references = references
+
+    def persistent_load(self, pid):
+        try:
+            return self.references[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(f"Snapshot refers to {pid}, which is not part of this episode")
+
+
+def _dumps(obj, references):
+    buffer = io.BytesIO()
+    EpisodePickler(buffer, references).dump(obj)
+    return buffer.getvalue()
+
+
+def _try_dumps(value, references):
+    """
+    Returns:
+        bytes: value pickled like the episode, None if it can't be pickled (also if its __reduce__ fails otherwise)
+    """
+    try:
+        return _dumps(value, references)
+    except Exception:
+        return None
+
+
+def _agent_identity(agent):
+    return agent.name, agent.actr_agent_type_name
+
+
+def _agent_state(agent, references):
+    actr_agent = agent.actr_agent
+    buffers = dict(actr_agent.goals)
+    buffers.update(actr_agent.retrievals)
+    # Nicht serialisierbare Adapter-Attribute (z.B. Verweise auf das pyactr Modell) baut die neue Episode selbst auf.
+    # Jedes Attribut wird genau einmal gepickelt und als Bytes abgelegt.
+    adapter = {}
+    for attribute, value in vars(agent.actr_adapter).items():
+        if attribute not in SKIPPED_ADAPTER_ATTRIBUTES:
+            payload = _try_dumps(value, references)
+            if payload is not None:
+                adapter[attribute] = payload
+    return {
+        "actr_time": agent.actr_time,
+        "no_increase_count": getattr(agent, "no_increase_count", 0),
+        "reset_count": agent.reset_count,
+        "rng": agent.rng.getstate(),
+        "social_status": {symbol: info["social_status"] for symbol, info in agent.agent_dictionary.items()},
+        "perception": {attribute: getattr(agent, attribute) for attribute in PERCEPTION_ATTRIBUTES},
+        # Inhalt und Zustand (z.B. state 'error' nach einem fehlgeschlagenen Abruf) von Goal- und Retrieval-Buffern;
+        # Motor- und Vision-Buffer legt ACTRModel.simulation ohnehin neu an
+        "buffers": {
+            name: {attribute: value for attribute, value in vars(buffer).items() if attribute not in SKIPPED_BUFFER_ATTRIBUTES}
+            for name, buffer in buffers.items()
+        },
+        # pyactr ändert manche Parameter zur Laufzeit, z.B. motor_prepared nach dem ersten Tastendruck
+        "model_parameters": dict(actr_agent.model_parameters),
+        "decmems": {name: dict(decmem._data) for name, decmem in actr_agent.decmems.items()},
+        "utilities": {name: actr_agent.productions[name]["utility"] for name in actr_agent.productions},
+        "adapter": adapter,
+    }
+
+
+def capture(simulation):
+    """
+    Returns:
+        bytes: zlib-compressed snapshot of the running episode
+    """
+    game = simulation.game_environment
+    if game is None:
+        raise RuntimeError("There is no episode to capture, build or run one first")
+    world = game.world
+    references = _references(simulation)
+    agent_indexes = {agent: index for index, agent in enumerate(simulation.all_agents)}
+
+    episode = {
+        "global_sim_time": simulation.global_sim_time,
+        "active_agents": [agent_indexes[agent] for agent in simulation.agent_list],
+        # Reihenfolge des Schedulers, sie entscheidet bei gleicher actr_time, wer zuerst dran ist
+        "schedule": [agent_indexes[agent] for agent in simulation.scheduler.ordered()],
+        "agents": [_agent_state(agent, references) for agent in simulation.all_agents],
+        "world": {
+            "terrain": world.terrain,
+            "damaged": [location.damaged for location in world.locations],
+            "food": world.food,
+            "agents": world.agents,
+            "agent_positions": game.agent_positions,
+            "cage": game.cage,
+            "sabotage_count": game.sabotage_count,
+            "repair_count": game.repair_count,
+        },
+        "middleman": {
+            "check_pending_agent": simulation.middleman.check_pending_agent,
+            "checked_agents": simulation.middleman.checked_agents,
+        },
+        "random": {
+            "simulation": simulation.rng.getstate(),
+            "global": random.getstate(),
+            "numpy": np.random.get_state(),
+        },
+    }
+    state = {
+        "format": FORMAT_VERSION,
+        "config": {attribute: getattr(simulation, attribute) for attribute in CONFIG_ATTRIBUTES},
+        "agents": [_agent_identity(agent) for agent in simulation.all_agents],
+        "chunk_types": _capture_chunk_types(),
+        "episode": _dumps(episode, references),
+    }
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _restore_world(game, world_state):
+    world = game.world
+    if not np.array_equal(world.terrain, world_state["terrain"]):
+        raise ValueError("The snapshot belongs to a different level")
+
+    for location, damaged in zip(world.locations, world_state["damaged"]):
+        location.damaged = damaged
+    world.damaged_count = sum(world_state["damaged"])
+    world.food = world_state["food"]
+    world.agents = world_state["agents"]
+    world.occupancy[:] = 0
+    for (r, c), agents in world.agents.items():
+        world.occupancy[r, c] = len(agents)
+
+    game.agent_positions = world_state["agent_positions"]
+    game.cage = world_state["cage"]
+    game.sabotage_count = world_state["sabotage_count"]
+    game.repair_count = world_state["repair_count"]
+
+    # Jede Zelle gilt als geändert, damit alle Agenten neu wahrnehmen und die GUI alles neu zeichnet
+    rows, cols = world.shape
+    game.mark_changed(*((r, c) for r in range(rows) for c in range(cols)))
+
+
+def _restore_agent(agent, agent_state, references):
+    agent.actr_time = agent_state["actr_time"]
+    agent.no_increase_count = agent_state["no_increase_count"]
+    agent.reset_count = agent_state["reset_count"]
+    agent.rng.setstate(agent_state["rng"])
+    agent.perception_key = None
+    for attribute, value in agent_state["perception"].items():
+        setattr(agent, attribute, value)
+    for symbol, social_status in agent_state["social_status"].items():
+        agent.agent_dictionary[symbol]["social_status"] = social_status
+
+    actr_agent = agent.actr_agent
+    buffers = dict(actr_agent.goals)
+    buffers.update(actr_agent.retrievals)
+    for name, buffer_state in agent_state["buffers"].items():
+        # Direkt setzen, Goal.add würde den alten Inhalt ins Gedächtnis schreiben
+        for attribute, value in buffer_state.items():
+            setattr(buffers[name], attribute, value)
+    # In place, die DecMemBuffer teilen sich das dict mit dem Modell
+    actr_agent.model_parameters.update(agent_state["model_parameters"])
+    for name, data in agent_state["decmems"].items():
+        actr_agent.decmems[name]._data = data
+    for name, utility in agent_state["utilities"].items():
+        actr_agent.productions[name]["utility"] = utility
+
+    for attribute, payload in agent_state["adapter"].items():
+        setattr(agent.actr_adapter, attribute, EpisodeUnpickler(io.BytesIO(payload), references).load())
+    agent.set_simulation()
+
+
+def restore(simulation, data):
+    """
+    Applies a snapshot of capture() onto the simulation. Without an episode, the episode is built from the
+    configuration stored in the snapshot first.
+    """
+    state = pickle.loads(zlib.decompress(data))
+    if state.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {state.get('format')}")
+
+    if simulation.game_environment is None:
+        for attribute, value in state["config"].items():
+            setattr(simulation, attribute, value)
+        simulation.build_episode()
+    # Vor dem Überschreiben prüfen, ob dieselben Agenten in derselben Reihenfolge mitspielen
+    if [_agent_identity(agent) for agent in simulation.all_agents] != state["agents"]:
+        raise ValueError("The snapshot belongs to an episode with different agents")
+
+    # Nach build_episode, das den Chunktypen eigene Slots hinzufügen kann, und vor dem Entpacken der Chunks
+    _restore_chunk_types(state["chunk_types"])
+    references = _references(simulation)
+    episode = EpisodeUnpickler(io.BytesIO(state["episode"]), references).load()
+
+    _restore_world(simulation.game_environment, episode["world"])
+    for agent, agent_state in zip(simulation.all_agents, episode["agents"]):
+        _restore_agent(agent, agent_state, references)
+
+    simulation.global_sim_time = episode["global_sim_time"]
+    simulation.agent_list = [simulation.all_agents[index] for index in episode["active_agents"]]
+    simulation.scheduler = AgentScheduler([simulation.all_agents[index] for index in episode["schedule"]])
+
+    simulation.middleman.check_pending_agent = episode["middleman"]["check_pending_agent"]
+    simulation.middleman.checked_agents = episode["middleman"]["checked_agents"]
+
+    # Zuletzt, damit nichts beim Wiederaufbau Zufallszahlen verbraucht
+    simulation.rng.setstate(episode["random"]["simulation"])
+    random.setstate(episode["random"]["global"])
+    np.random.set_state(episode["random"]["numpy"])
+
+    simulation.game_environment.publish_snapshot(simulation.global_sim_time)
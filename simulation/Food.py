@@ -1,9 +1,9 @@
 import random
 
 class Food:
-    def __init__(self):
-        self.saturation = random.randint(1, 3)
-        self.amount = random.randint(1, 10)
+    def __init__(self, rng=random):
+        self.saturation = rng.randint(1, 3)
+        self.amount = rng.randint(1, 10)
         self.time_till_regrowth = 0
 
     def get_saturation(self):
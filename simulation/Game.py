@@ -1,48 +1,191 @@
+import numpy as np
 from gui.GUI import MatrixWorldGUI
-from simulation.Wall import Wall
-from simulation.Water import Water
-from simulation.Location import Location
+from simulation.GameOver import GameOver
+from simulation.SnapshotQueue import SnapshotQueue
+from simulation.WorldSnapshot import WorldSnapshot
+from simulation.WorldStore import WorldStore, WALL, WATER
+from simulation.LevelMatrixView import LevelMatrixView
+from simulation.Pathing import Pathing
+
 
 class Game:
     """
     The matrix environment.
 
     Attributes:
-        gui (GUI from TK): The gui, which displays the game
+        gui (GUI from TK): The gui, which displays the game. None in headless runs
+        world (WorldStore): Kompakte Speicherung von Terrain, Locations, Food und Agenten, zählt beschädigte Locations mit
+        level_matrix (LevelMatrixView): Read-only Sicht auf world im Stil der alten 2D-Liste von Zellinhalten
         cage (dict): Hält eingesperrte Agenten mit ihrem actr_time-Timestamp
+        agent_positions (dict): Agent → (Zeile, Spalte), wird bei jeder Bewegung mitgeführt
+        terrain (np.ndarray): uint8 Terrain-Code pro Zelle (EMPTY, WALL, WATER, LOCATION, FOOD), world.terrain
+        occupancy (np.ndarray): Anzahl der Agenten pro Zelle, world.occupancy
+        pathing (Pathing): Kürzeste Wege über Walls und Water hinweg, Distanzfelder pro Ziel werden gecacht
+        version (int): Weltversion, steigt bei jeder Änderung der Welt monoton an
+        cell_versions (np.ndarray): Weltversion der letzten Änderung pro Zelle
+        sabotage_count (int): Anzahl erfolgreicher Sabotagen
+        repair_count (int): Anzahl erfolgreicher Reparaturen
+        snapshots (SnapshotQueue): Übergabe der WorldSnapshots an die GUI, None in headless runs
+        snapshot (WorldSnapshot): Zuletzt veröffentlichter Snapshot
+        pending_cells (set): Seit dem letzten Snapshot geänderte Zellen
+        published_stimuli (dict): Agent → visual_stimuli-Liste, die zuletzt in einen Snapshot kopiert wurde
     """
 
     def __init__(self, gui, level_matrix):
         """
         Args:
-            gui: displays the game
+            gui: displays the game, None for headless runs
             level_matrix: 2D-Liste mit Zellinhalten (Agenten, Walls, Water, Location, Food, etc.)
         """
-        # Jedes Level-Element in eine Liste packen, falls es noch keine ist
-        self.level_matrix = [
-            [cell if isinstance(cell, list) else [cell] for cell in row]
-            for row in level_matrix
-        ]
+        self.world = WorldStore(level_matrix)
+        self.level_matrix = LevelMatrixView(self.world)
+        # NumPy-Ebenen, damit Sichtfelder als Array-Ausschnitt gelesen werden können
+        self.terrain = self.world.terrain
+        self.occupancy = self.world.occupancy
+        # Das Terrain ändert sich während einer Episode nicht, die Distanzfelder bleiben also gültig
+        self.pathing = Pathing.from_terrain(self.terrain)
 
         # Cage initialisieren: { agent_instance: timestamp }
         self.cage = {}
+        self.sabotage_count = 0
+        self.repair_count = 0
+
+        # Positionsindex: { agent_instance: (row, col) }, damit find_agent nicht die ganze Matrix durchsucht.
+        # Steht derselbe Agent in mehreren Zellen, gilt wie bisher die erste Zelle in Zeilenreihenfolge.
+        self.agent_positions = {}
+        for position in sorted(self.world.agents):
+            for agent in self.world.agents[position]:
+                self.agent_positions.setdefault(agent, position)
+
+        # Versionierung, damit Agenten ihr Sichtfeld nur bei Änderungen neu wahrnehmen
+        rows, cols = self.world.shape
+        self.version = 0
+        self.cell_versions = np.zeros((rows, cols), dtype=np.int64)
+
+        # Snapshots für die GUI; die GUI zeichnet nur daraus und nie direkt aus der Welt
+        self.snapshots = None
+        self.snapshot = None
+        self.pending_cells = set()
+        self.published_stimuli = {}
+
+        # GUI erstellen und erste Aktualisierung (headless: keine GUI)
+        self.gui = None
+        if gui is not None:
+            self.snapshots = SnapshotQueue()
+            self.publish_snapshot(0)
+            self.gui = MatrixWorldGUI(self, gui)
+            self.gui.update()
 
-        # GUI erstellen und erste Aktualisierung
-        self.gui = MatrixWorldGUI(self, gui)
-        self.gui.update()
+    def find_agent(self, agent):
+        """
+        Returns:
+            tuple: (row, col) of the agent in O(1), (None, None) if it's not part of the game
+        """
+        return self.agent_positions.get(agent, (None, None))
 
-        # Level-Matrix nochmals daraufhin aufbauen, dass alle Einträge Listen sind
-        self.level_matrix = [
-            [cell if isinstance(cell, list) else [cell] for cell in row]
-            for row in level_matrix
-        ]
+    def mark_changed(self, *cells):
+        """
+        Meldet geänderte Zellen (Zeile, Spalte): erhöht die Weltversion und merkt die Zellen für den nächsten Snapshot vor.
+        """
+        self.version += 1
+        for r, c in cells:
+            self.cell_versions[r, c] = self.version
+        if self.snapshots is not None:
+            self.pending_cells.update(cells)
 
-    def find_agent(self, agent):
-        for r, row in enumerate(self.level_matrix):
-            for c, cell in enumerate(row):
-                if agent in cell:
-                    return r, c
-        return None, None
+    def publish_snapshot(self, sim_time):
+        """
+        Veröffentlicht den aktuellen Zustand als WorldSnapshot, falls sich seit dem letzten etwas geändert hat.
+        Wird einmal pro Schritt von der Simulation aufgerufen, nicht bei jeder einzelnen Änderung.
+        Die Wahrnehmung der Agenten wird mit kopiert, damit die GUI auch ihr Info-Panel nur aus Snapshots liest.
+        """
+        if self.snapshots is None:
+            return
+        previous = self.snapshot
+        # Middleman ersetzt visual_stimuli bei jeder neuen Wahrnehmung, die Identität zeigt also Änderungen an
+        new_stimuli = [agent for agent in self.agent_positions
+                       if self.published_stimuli.get(agent) is not agent.visual_stimuli]
+        if previous is not None and not self.pending_cells and not new_stimuli:
+            return
+
+        world = self.world
+        rows, cols = world.shape
+        if previous is None:
+            changed = frozenset((r, c) for r in range(rows) for c in range(cols))
+            cells = tuple(tuple(tuple(world.cell(r, c)) for c in range(cols)) for r in range(rows))
+            damaged = set()
+            food = {}
+            visual_stimuli = {}
+        else:
+            changed = frozenset(self.pending_cells)
+            # Nur geänderte Zeilen kopieren, der Rest wird mit dem vorherigen Snapshot geteilt
+            snapshot_rows = list(previous.cells)
+            for r in {r for r, _ in changed}:
+                snapshot_rows[r] = tuple(tuple(world.cell(r, c)) for c in range(cols))
+            cells = tuple(snapshot_rows)
+            damaged = set(previous.damaged)
+            food = dict(previous.food)
+            visual_stimuli = dict(previous.visual_stimuli)
+
+        for r, c in changed:
+            item = world.food.get((r, c))
+            if item is None:
+                food.pop((r, c), None)
+            else:
+                food[(r, c)] = (item.get_saturation(), item.get_amount(), item.get_time_till_regrowth())
+            location = world.location_at(r, c)
+            if location is None:
+                continue
+            if location.damaged:
+                damaged.add((r, c))
+            else:
+                damaged.discard((r, c))
+
+        for agent in new_stimuli:
+            self.published_stimuli[agent] = agent.visual_stimuli
+            visual_stimuli[agent] = tuple(tuple(row) for row in agent.visual_stimuli)
+
+        self.pending_cells.clear()
+        self.snapshot = WorldSnapshot(
+            self.version,
+            sim_time,
+            cells,
+            frozenset(damaged),
+            dict(self.agent_positions),
+            changed,
+            food,
+            visual_stimuli
+        )
+        self.snapshots.publish(self.snapshot)
+
+    def perception_key(self, agent):
+        """
+        Describes everything the agent's perception depends on: its position and the latest change in its field of
+        view. As long as the key stays the same, the previous stimuli are still valid.
+
+        Returns:
+            tuple: (row, col, version)
+        """
+        r, c = self.find_agent(agent)
+        if r is None:
+            return None, None, self.version
+        rows, cols = self.terrain.shape
+        top, left, height, width = self.field_of_view(r, c, agent.los)
+        window = self.cell_versions[max(top, 0):min(top + height, rows), max(left, 0):min(left + width, cols)]
+        return r, c, int(window.max())
+
+    def field_of_view(self, r, c, los):
+        """
+        Window of the map, which an agent at (r, c) sees. With los = 0 or a los larger than the map it has the size
+        of the whole map, but starts at the agent's own cell (as the original field of view loops did).
+
+        Returns:
+            tuple: (top, left, height, width) in map coordinates, the window may reach over the map border
+        """
+        rows, cols = self.terrain.shape
+        if los == 0 or los > cols or los > rows:
+            return r, c, rows, cols
+        return r - los, c - los, 2 * los + 1, 2 * los + 1
 
     def move_agent(self, agent, dr, dc):
         """
@@ -65,25 +208,26 @@ class Game:
                 # 8 Sekunden vorbei → Agent frei lassen
                 del self.cage[agent]
 
-        position = self.find_agent(agent)
-        if position is None:
+        r, c = self.find_agent(agent)
+        if r is None:
             return False
 
-        r, c = position
         nr, nc = r + dr, c + dc
 
         # Check if new position is within bounds
-        if not (0 <= nr < len(self.level_matrix) and 0 <= nc < len(self.level_matrix[0])):
+        rows, cols = self.world.shape
+        if not (0 <= nr < rows and 0 <= nc < cols):
             return False
 
         # Check if new position contains a Wall oder Water
-        if any(isinstance(obj, (Wall, Water)) for obj in self.level_matrix[nr][nc]):
+        if self.terrain[nr, nc] in (WALL, WATER):
             return False
 
         # Move agent
-        self.level_matrix[r][c].remove(agent)
-        self.level_matrix[nr][nc].append(agent)
-        self.gui.update()  # Update the GUI after the agent moves
+        self.world.remove_agent(agent, r, c)
+        self.world.place_agent(agent, nr, nc)
+        self.agent_positions[agent] = (nr, nc)
+        self.mark_changed((r, c), (nr, nc))
         return True
 
     def move_agent_top(self, agent):
@@ -99,17 +243,16 @@ class Game:
         return self.move_agent(agent, 0, 1)
 
     def remove_agent_from_game(self, agent):
-        position = self.find_agent(agent)
-        if position is not None:
-            r, c = position
+        r, c = self.agent_positions.pop(agent, (None, None))
+        if r is not None:
             try:
-                self.level_matrix[r][c].remove(agent)
+                self.world.remove_agent(agent, r, c)
                 print(f"Agent {agent.name} removed from cell ({r}, {c}).")
             except ValueError:
                 print(f"Agent {agent.name} not found in cell ({r}, {c}).")
+            self.mark_changed((r, c))
         else:
             print(f"Agent {agent.name} not found in the matrix.")
-        self.gui.update()
 
     def sabotage(self, agent):
         """
@@ -126,52 +269,34 @@ class Game:
         Returns:
             bool: True, wenn eine Location gefunden und sabotiert wurde; sonst False.
         """
-        position = self.find_agent(agent)
-        if position is None:
+        r, c = self.find_agent(agent)
+        if r is None:
             return False
 
-        r, c = position
-        rows = len(self.level_matrix)
-        cols = len(self.level_matrix[0])
+        rows, cols = self.world.shape
 
         # Alle Nachbarn inklusive der eigenen Zelle
         neighbors = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]
         for dr, dc in neighbors:
             nr, nc = r + dr, c + dc
             if 0 <= nr < rows and 0 <= nc < cols:
-                for obj in self.level_matrix[nr][nc]:
-                    if isinstance(obj, Location):
-                        # Nur sabotieren, falls es bisher nicht beschädigt war
-                        if not getattr(obj, "damaged", False):
-                            obj.damaged = True
-
-                            # Agent in den Cage einsperren
-                            self.cage[agent] = agent.actr_time
-
-                            # GUI sofort neu zeichnen (damaged-Overlay anzeigen)
-                            self.gui.draw_grid()
-                            self.gui.canvas.update_idletasks()
-                            self.gui.canvas.update()
-
-                            # Prüfen, ob nach diesem Sabotage-Schritt ALLE Locations beschädigt sind
-                            all_damaged = True
-                            for row in self.level_matrix:
-                                for cell in row:
-                                    for element in cell:
-                                        if isinstance(element, Location) and not getattr(element, "damaged", False):
-                                            all_damaged = False
-                                            break
-                                    if not all_damaged:
-                                        break
-                                if not all_damaged:
-                                    break
-
-                            if all_damaged:
-                                # Wenn wirklich jede Location beschädigt ist, Simulation beenden
-                                raise RuntimeError("Game Over - Imposter won")
-
-                            return True
-                        # Wenn Location bereits damaged=True ist, ignorieren und weiter suchen
+                # Nur sabotieren, falls es bisher nicht beschädigt war
+                if self.world.set_damaged(nr, nc, True):
+                    self.sabotage_count += 1
+
+                    # Agent in den Cage einsperren
+                    self.cage[agent] = agent.actr_time
+
+                    # Zelle als geändert melden (damaged-Overlay anzeigen)
+                    self.mark_changed((nr, nc))
+
+                    # Prüfen, ob nach diesem Sabotage-Schritt ALLE Locations beschädigt sind (Zähler im WorldStore)
+                    if self.world.all_damaged:
+                        # Wenn wirklich jede Location beschädigt ist, Simulation beenden
+                        raise GameOver("Game Over - Imposter won", winner="Imposter")
+
+                    return True
+                # Wenn Location bereits damaged=True ist, ignorieren und weiter suchen
         return False
 
     def repair(self, agent):
@@ -188,30 +313,24 @@ class Game:
         Returns:
             bool: True, wenn eine Location gefunden und repariert wurde; sonst False.
         """
-        position = self.find_agent(agent)
-        if position is None:
+        r, c = self.find_agent(agent)
+        if r is None:
             return False
 
-        r, c = position
-        rows = len(self.level_matrix)
-        cols = len(self.level_matrix[0])
+        rows, cols = self.world.shape
 
         # Nachbarn inklusive eigene Zelle
         neighbors = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]
         for dr, dc in neighbors:
             nr, nc = r + dr, c + dc
             if 0 <= nr < rows and 0 <= nc < cols:
-                for obj in self.level_matrix[nr][nc]:
-                    if isinstance(obj, Location):
-                        # Nur reparieren, falls es bisher beschädigt war
-                        if getattr(obj, "damaged", False):
-                            obj.damaged = False
-                            # Agent in den Cage für 8 Sekunden einsperren
-                            self.cage[agent] = agent.actr_time
-                            # GUI sofort neu zeichnen (damaged-Overlay entfernen)
-                            self.gui.draw_grid()
-                            self.gui.canvas.update_idletasks()
-                            self.gui.canvas.update()
-                            return True
-                        # Wenn bereits damaged=False, ignorieren und weiter suchen
+                # Nur reparieren, falls es bisher beschädigt war
+                if self.world.set_damaged(nr, nc, False):
+                    self.repair_count += 1
+                    # Agent in den Cage für 8 Sekunden einsperren
+                    self.cage[agent] = agent.actr_time
+                    # Zelle als geändert melden (damaged-Overlay entfernen)
+                    self.mark_changed((nr, nc))
+                    return True
+                # Wenn bereits damaged=False, ignorieren und weiter suchen
         return False
@@ -0,0 +1,14 @@
+class GameOver(RuntimeError):
+    """
+    Raised by the environment when an episode is decided.
+
+    It is a RuntimeError, so the interactive simulation keeps treating it like before. Headless runs catch it
+    to end the episode.
+
+    Attributes:
+        winner (str): "Imposter" or "Crew"
+    """
+
+    def __init__(self, message, winner):
+        super().__init__(message)
+        self.winner = winner
@@ -1,11 +1,12 @@
 import random
-from collections import deque
+import numpy as np
 from simulation.Food import Food
 from simulation.Wall import Wall
 from simulation.Water import Water
 from simulation.Location import Location
+from simulation.Pathing import Pathing
 
-def _build_default(height, width, agents, food_amount, wall_density):
+def _build_default(height, width, agents, food_amount, wall_density, rng=random):
     total_cells = height * width
     wall_count = int(total_cells * (wall_density / 100))
     total_objects = len(agents) + food_amount + wall_count
@@ -15,8 +16,8 @@ def _build_default(height, width, agents, food_amount, wall_density):
 
     def get_random_empty_position():
         while True:
-            row = random.randint(0, height - 1)
-            col = random.randint(0, width - 1)
+            row = rng.randint(0, height - 1)
+            col = rng.randint(0, width - 1)
             if matrix[row][col] is None:
                 return row, col
 
@@ -25,7 +26,7 @@ def _build_default(height, width, agents, food_amount, wall_density):
         matrix[row][col] = agent
     for _ in range(food_amount):
         row, col = get_random_empty_position()
-        matrix[row][col] = Food()
+        matrix[row][col] = Food(rng)
     for _ in range(wall_count):
         row, col = get_random_empty_position()
         matrix[row][col] = Wall()
@@ -36,20 +37,7 @@ def _build_default(height, width, agents, food_amount, wall_density):
 
 
 def _are_all_accessible(matrix, agents, height, width):
-    def is_valid(r, c):
-        return 0 <= r < height and 0 <= c < width and not isinstance(matrix[r][c], Wall)
-
-    def bfs(start):
-        visited = {start}
-        queue = deque([start])
-        while queue:
-            r, c = queue.popleft()
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if is_valid(nr, nc) and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
-        return visited
+    walkable = np.array([[not isinstance(matrix[r][c], Wall) for c in range(width)] for r in range(height)])
 
     positions = [
         (r, c)
@@ -59,11 +47,11 @@ def _are_all_accessible(matrix, agents, height, width):
     ]
     if not positions:
         return True
-    accessible_positions = bfs(positions[0])
-    return all(pos in accessible_positions for pos in positions)
+    accessible = Pathing(walkable).reachable(positions[0])
+    return all(accessible[pos] for pos in positions)
 
 
-def build_perception_and_action_1(height, width, agents, food_amount, wall_density):
+def build_perception_and_action_1(height, width, agents, food_amount, wall_density, rng=random):
     if len(agents) != 1:
         raise ValueError("Perception & Action 1 benötigt genau einen Agenten")
     size = 5
@@ -71,12 +59,12 @@ def build_perception_and_action_1(height, width, agents, food_amount, wall_densi
     center = size // 2
     matrix[center][center] = agents[0]
     available = [(r, c) for r in range(size) for c in range(size) if (r, c) != (center, center)]
-    for r, c in random.sample(available, 3):
-        matrix[r][c] = Food()
+    for r, c in rng.sample(available, 3):
+        matrix[r][c] = Food(rng)
     return matrix
 
 
-def build_perception_and_action_2(height, width, agents, food_amount, wall_density):
+def build_perception_and_action_2(height, width, agents, food_amount, wall_density, rng=random):
     if len(agents) != 1:
         raise ValueError("Perception & Action 2 benötigt genau einen Agenten")
     size = 5
@@ -85,11 +73,11 @@ def build_perception_and_action_2(height, width, agents, food_amount, wall_densi
     matrix[center][center] = agents[0]
     fixed_positions = [(0, 0), (0, 4), (4, 0)]
     for r, c in fixed_positions:
-        matrix[r][c] = Food()
+        matrix[r][c] = Food(rng)
     return matrix
 
 
-def build_perception_and_action_3(height, width, agents, food_amount, wall_density):
+def build_perception_and_action_3(height, width, agents, food_amount, wall_density, rng=random):
     if len(agents) != 2:
         raise ValueError("Perception & Action 3 benötigt genau zwei Agenten")
     h, w = 2, 10
@@ -103,7 +91,7 @@ def build_perception_and_action_3(height, width, agents, food_amount, wall_densi
     return matrix
 
 
-def build_chunks_1(height, width, agents, food_amount, wall_density):
+def build_chunks_1(height, width, agents, food_amount, wall_density, rng=random):
     # Spielfeld 1 hoch, 2 breit
     matrix = [[None for _ in range(2)] for _ in range(1)]
     glumanda = next((a for a in agents if a.name == 'Glumanda'), None)
@@ -113,7 +101,7 @@ def build_chunks_1(height, width, agents, food_amount, wall_density):
         raise ValueError("Agents-Liste muss Instanzen von Glumanda, Sarzenia und einem weiteren Agenten enthalten")
     matrix[0][0] = individual_agent
     # benutze vorhandene Agent-Instanzen, nicht erneut konstruieren
-    matrix[0][1] = random.choice([glumanda, sarzenia])
+    matrix[0][1] = rng.choice([glumanda, sarzenia])
     if matrix[0][1] is glumanda:
         glumanda.middleman.simulation.agent_list.remove(sarzenia)
     else:
@@ -121,7 +109,7 @@ def build_chunks_1(height, width, agents, food_amount, wall_density):
     return matrix
 
 
-def build_chunks_2(height, width, agents, food_amount, wall_density):
+def build_chunks_2(height, width, agents, food_amount, wall_density, rng=random):
     size = 3
     matrix = [[None for _ in range(size)] for _ in range(size)]
     pinsir_proto = next((a for a in agents if a.name == 'Pinsir'), None)
@@ -130,14 +118,14 @@ def build_chunks_2(height, width, agents, food_amount, wall_density):
         raise ValueError("Agents-Liste muss mindestens einen Pinsir und einen weiteren Agenten enthalten")
     center = size // 2
     matrix[center][center] = other
-    count_pinsir = random.randint(1, 5)
+    count_pinsir = rng.randint(1, 5)
     positions = [(r, c) for r in range(size) for c in range(size) if (r, c) != (center, center)]
-    for r, c in random.sample(positions, count_pinsir):
+    for r, c in rng.sample(positions, count_pinsir):
         matrix[r][c] = pinsir_proto
     return matrix
 
 
-def build_utility_reinforcement_learning_1(height, width, agents, food_amount, wall_density):
+def build_utility_reinforcement_learning_1(height, width, agents, food_amount, wall_density, rng=random):
     size = 3
     matrix = [[None for _ in range(size)] for _ in range(size)]
     deoxys_proto = next((a for a in agents if a.name == 'Deoxys'), None)
@@ -153,8 +141,8 @@ def build_utility_reinforcement_learning_1(height, width, agents, food_amount, w
         (center, size-1): 1.00
     }
     for (r, c), food_prob in dirs.items():
-        if random.random() < food_prob:
-            matrix[r][c] = Food()
+        if rng.random() < food_prob:
+            matrix[r][c] = Food(rng)
         else:
             matrix[r][c] = deoxys_proto
     if deoxys_proto is None:
@@ -162,7 +150,7 @@ def build_utility_reinforcement_learning_1(height, width, agents, food_amount, w
     return matrix
 
 
-def build_utility_reinforcement_learning_2(height, width, agents, food_amount, wall_density):
+def build_utility_reinforcement_learning_2(height, width, agents, food_amount, wall_density, rng=random):
     h, w = 13, 3
     matrix = [[None for _ in range(w)] for _ in range(h)]
     darkrai_proto = next((a for a in agents if a.name == 'Darkrai'), None)
@@ -172,7 +160,7 @@ def build_utility_reinforcement_learning_2(height, width, agents, food_amount, w
         raise ValueError("Agents-Liste muss Darkrai, Glumanda und mindestens einen weiteren Agenten enthalten")
     mid_row = h // 2
     matrix[mid_row][w // 2] = center_agent
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         matrix[0][w // 2] = darkrai_proto
         matrix[h-1][w // 2] = glumanda_proto
     else:
@@ -181,23 +169,23 @@ def build_utility_reinforcement_learning_2(height, width, agents, food_amount, w
     return matrix
 
 
-def build_utility_reinforcement_learning_3(height, width, agents, food_amount, wall_density):
-    return _build_default(height, width, agents, food_amount, wall_density)
+def build_utility_reinforcement_learning_3(height, width, agents, food_amount, wall_density, rng=random):
+    return _build_default(height, width, agents, food_amount, wall_density, rng)
 
 
-def build_affect_deduction_paralogism_1(height, width, agents, food_amount, wall_density):
-    return _build_default(height, width, agents, food_amount, wall_density)
+def build_affect_deduction_paralogism_1(height, width, agents, food_amount, wall_density, rng=random):
+    return _build_default(height, width, agents, food_amount, wall_density, rng)
 
 
-def build_affect_deduction_paralogism_2(height, width, agents, food_amount, wall_density):
-    return _build_default(height, width, agents, food_amount, wall_density)
+def build_affect_deduction_paralogism_2(height, width, agents, food_amount, wall_density, rng=random):
+    return _build_default(height, width, agents, food_amount, wall_density, rng)
 
 
-def build_affect_deduction_paralogism_3(height, width, agents, food_amount, wall_density):
-    return _build_default(height, width, agents, food_amount, wall_density)
+def build_affect_deduction_paralogism_3(height, width, agents, food_amount, wall_density, rng=random):
+    return _build_default(height, width, agents, food_amount, wall_density, rng)
 
 
-def build_agent_project(height, width, agents, food_amount, wall_density):
+def build_agent_project(height, width, agents, food_amount, wall_density, rng=random):
     """
     Neues Level: 'Agent Project'
     - Fehlermeldung, wenn kein Agent mit name == 'Imposter' vorhanden ist.
@@ -283,7 +271,7 @@ def build_agent_project(height, width, agents, food_amount, wall_density):
     return matrix
 
 
-def build_level(height, width, agents, food_amount, wall_density, level_type=None):
+def build_level(height, width, agents, food_amount, wall_density, level_type=None, rng=random):
     presets = {
         'Perception & Action 1': build_perception_and_action_1,
         'Perception & Action 2': build_perception_and_action_2,
@@ -298,7 +286,7 @@ def build_level(height, width, agents, food_amount, wall_density, level_type=Non
         'Agent Project': build_agent_project,  # Neu hinzugefügt
     }
     if level_type is None:
-        return _build_default(height, width, agents, food_amount, wall_density)
+        return _build_default(height, width, agents, food_amount, wall_density, rng)
     if level_type in presets:
-        return presets[level_type](height, width, agents, food_amount, wall_density)
+        return presets[level_type](height, width, agents, food_amount, wall_density, rng)
     raise ValueError("Unbekannter Level-Typ: {}".format(level_type))
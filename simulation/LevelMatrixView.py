@@ -0,0 +1,53 @@
+class LevelMatrixView:
+    """
+    Read-only Sicht auf einen WorldStore im Stil der alten level_matrix: view[r][c] ist die Liste der Objekte der Zelle.
+    Die Zellen werden bei jedem Zugriff neu gebaut, Änderungen an ihnen wirken sich nicht auf die Welt aus.
+
+    Attributes:
+        world (WorldStore): The store the view reads from
+    """
+
+    def __init__(self, world):
+        self.world = world
+
+    def __len__(self):
+        return self.world.terrain.shape[0]
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += len(self)
+        if not 0 <= r < len(self):
+            raise IndexError("level_matrix row index out of range")
+        return LevelMatrixRow(self.world, r)
+
+    def __iter__(self):
+        for r in range(len(self)):
+            yield LevelMatrixRow(self.world, r)
+
+
+class LevelMatrixRow:
+    """
+    Eine Zeile der LevelMatrixView.
+
+    Attributes:
+        world (WorldStore): The store the row reads from
+        r (int): Row index
+    """
+
+    def __init__(self, world, r):
+        self.world = world
+        self.r = r
+
+    def __len__(self):
+        return self.world.terrain.shape[1]
+
+    def __getitem__(self, c):
+        if c < 0:
+            c += len(self)
+        if not 0 <= c < len(self):
+            raise IndexError("level_matrix column index out of range")
+        return self.world.cell(self.r, c)
+
+    def __iter__(self):
+        for c in range(len(self)):
+            yield self.world.cell(self.r, c)
@@ -2,6 +2,7 @@
     Library which extends pyactr for an easier usage and with some additional features.
 """
 from itertools import islice
+import numpy as np
 import pyactr as actr
 import pyactr.vision as vision
 from pyactr import chunks, utilities
@@ -9,112 +10,221 @@ from pyactr.utilities import ACTRError
 
 from simulation import AgentConstruct
 from simulation.AgentConstruct import AgentConstruct
-from simulation.Location import Location
+from simulation.WorldStore import LOCATION
 from collections.abc import MutableSet, MutableSequence
 
 
-def fix_pyactr():
+# Registry of all pyactr methods replaced by this library: (owner, method name) -> original method
+_patches = {}
+
+
+def install_patch(owner, name, replacement):
     """
-    Overrides pyactr visual class. There's an issue with attending objects & Chunk information especially with automatic visual search set to True
+    Replaces a pyactr method exactly once. Further calls are ignored, the original method is kept in the registry.
+
+    Args:
+        owner: Class which owns the method, e.g. vision.VisualLocation
+        name (str): Name of the method
+        replacement (function): The patched method
+
+    Returns:
+        bool: True if the patch was installed by this call
     """
+    if (owner, name) in _patches:
+        return False
+    _patches[(owner, name)] = getattr(owner, name)
+    setattr(owner, name, replacement)
+    return True
 
-    # Backup the original method
-    _original_find = vision.VisualLocation.find
 
-    # Patched find method with corrected attribute lookup
+def original_method(owner, name):
+    """
+    Returns the unpatched pyactr method, e.g. to benchmark it against the patched one.
+    """
+    return _patches[(owner, name)]
 
-    def patched_find(self, otherchunk, actrvariables=None, extra_tests=None):
-        # Initialize variables
-        if extra_tests is None:
-            extra_tests = {}
-        if actrvariables is None:
-            actrvariables = {}
 
-        # Build search chunk from production right-hand side
-        try:
-            mod_attr_val = {x[0]: utilities.check_bound_vars(actrvariables, x[1], negative_impossible=False)
-                            for x in otherchunk.removeunused()}
-        except ACTRError as e:
-            raise ACTRError(f"The chunk '{otherchunk}' is not defined correctly; {e}")
-        chunk_used_for_search = chunks.Chunk(utilities.VISUALLOCATION, **mod_attr_val)
-
-        found = None
-        found_stim = None
-        closest = float("inf")
-        x_closest = float("inf")
-        y_closest = float("inf")
-
-        # Iterate over stimulus keys and their attribute dicts
-        for each in self.environment.stimulus:
-            stim_attrs = self.environment.stimulus[each]
-
-            # Extra-tests for attended flag
-            try:
-                attended_flag = extra_tests.get("attended")
-                if attended_flag in (False, 'False') and self.finst and stim_attrs in self.recent:
-                    continue
-                if attended_flag not in (False, 'False') and self.finst and stim_attrs not in self.recent:
-                    continue
-            except KeyError:
-                pass
-
-            # Value test
-            if (chunk_used_for_search.value != chunk_used_for_search.EmptyValue() and
-                    chunk_used_for_search.value.values != stim_attrs.get("text")):
-                continue
-
-            # Position extraction
-            position = (int(stim_attrs['position'][0]), int(stim_attrs['position'][1]))
-
-            # Screen-X/Y absolute tests
-            try:
-                if (chunk_used_for_search.screen_x.values and
-                        int(chunk_used_for_search.screen_x.values) != position[0]):
-                    continue
-            except (TypeError, ValueError, AttributeError):
-                pass
-            try:
-                if (chunk_used_for_search.screen_y.values and
-                        int(chunk_used_for_search.screen_y.values) != position[1]):
-                    continue
-            except (TypeError, ValueError, AttributeError):
-                pass
-
-            # Additional relative and closest tests omitted for brevity...
-            # [Include the rest of the original distance checks here]
-
-            # If stimulus passes all tests, prepare the visible chunk
+def patched_methods():
+    """
+    Reports which pyactr methods are patched.
+
+    Returns:
+        dict: "module.Class.method" -> True if the patch is still installed
+    """
+    return {
+        f"{owner.__module__}.{owner.__qualname__}.{name}": getattr(owner, name) is not original
+        for (owner, name), original in _patches.items()
+    }
+
+
+def _absolute_coordinate(slot):
+    """
+    Returns the absolute screen coordinate requested in a visual location slot or None if there is no such constraint.
+    The exception handling avoids the case in which the slot has an empty value (then "values" is undefined).
+    """
+    try:
+        if slot.values:
+            return int(slot.values)
+    except (TypeError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _stimulus_index(environment):
+    """
+    Lookup tables for the current stimulus frame of the environment. They are built once per frame and reused by all
+    visual location requests on that frame. The patched Environment.output drops them with every new frame, code that
+    changes environment.stimulus in place has to call invalidate_stimulus_index.
+
+    Returns:
+        tuple: (entries, by_text, by_position, unpositioned) with entries as list of (stimulus attributes, (x, y)) in
+        stimulus order, both dicts mapping to the indices of the matching entries and unpositioned as the indices of
+        stimuli without a position (their position is None)
+    """
+    stimulus = environment.stimulus or {}
+    cached = getattr(environment, "_stimulus_index", None)
+    if cached is not None and cached[0] is stimulus:
+        return cached[1]
+
+    entries = []
+    by_text = {}
+    by_position = {}
+    unpositioned = []
+    for stim_attrs in stimulus.values():
+        position = stim_attrs.get("position")
+        if position is None:
+            unpositioned.append(len(entries))
+        else:
+            position = (int(position[0]), int(position[1]))
+            by_position.setdefault(position, []).append(len(entries))
+        by_text.setdefault(stim_attrs.get("text"), []).append(len(entries))
+        entries.append((stim_attrs, position))
+
+    index = (entries, by_text, by_position, unpositioned)
+    environment._stimulus_index = (stimulus, index)
+    return index
+
+
+def invalidate_stimulus_index(environment):
+    """Drops the stimulus index of the environment, so the next visual location request rebuilds it."""
+    environment._stimulus_index = None
+
+
+def patched_output(self, stimulus):
+    """
+    Replacement for pyactr.environment.Environment.output, which also invalidates the stimulus index of the frame.
+    """
+    invalidate_stimulus_index(self)
+    original_method(actr.Environment, "output")(self, stimulus)
+
+
+def patched_find(self, otherchunk, actrvariables=None, extra_tests=None):
+    """
+    Replacement for pyactr.vision.VisualLocation.find with corrected attribute lookup.
+    Value and absolute position constraints are answered by the stimulus index. Like before, the last matching
+    stimulus wins, so candidates are checked in reverse and the chunk is only built for the winner.
+    """
+    # Initialize variables
+    if extra_tests is None:
+        extra_tests = {}
+    if actrvariables is None:
+        actrvariables = {}
+
+    # Build search chunk from production right-hand side
+    try:
+        mod_attr_val = {x[0]: utilities.check_bound_vars(actrvariables, x[1], negative_impossible=False)
+                        for x in otherchunk.removeunused()}
+    except ACTRError as e:
+        raise ACTRError(f"The chunk '{otherchunk}' is not defined correctly; {e}")
+    chunk_used_for_search = chunks.Chunk(utilities.VISUALLOCATION, **mod_attr_val)
+
+    entries, by_text, by_position, unpositioned = _stimulus_index(self.environment)
+
+    # Value and Screen-X/Y absolute constraints
+    has_text = chunk_used_for_search.value != chunk_used_for_search.EmptyValue()
+    text = chunk_used_for_search.value.values if has_text else None
+    screen_x = _absolute_coordinate(chunk_used_for_search.screen_x)
+    screen_y = _absolute_coordinate(chunk_used_for_search.screen_y)
+
+    if screen_x is not None and screen_y is not None:
+        candidates = by_position.get((screen_x, screen_y), [])
+        if unpositioned:
+            candidates = sorted(candidates + unpositioned)
+    elif has_text:
+        candidates = by_text.get(text, [])
+    else:
+        candidates = range(len(entries))
+
+    attended_flag = extra_tests.get("attended")
+    subsumption = {}  # visible chunk and its test result per set of extra stimulus attributes
+    found = None
+    found_stim = None
+
+    for ordinal in reversed(candidates):
+        stim_attrs, position = entries[ordinal]
+
+        # Extra-tests for attended flag
+        if attended_flag in (False, 'False') and self.finst and stim_attrs in self.recent:
+            continue
+        if attended_flag not in (False, 'False') and self.finst and stim_attrs not in self.recent:
+            continue
+
+        # Remaining value and position tests, a stimulus without position fails here like in the original find
+        if has_text and text != stim_attrs.get("text"):
+            continue
+        if position is None:
+            raise KeyError("position")
+        if screen_x is not None and screen_x != position[0]:
+            continue
+        if screen_y is not None and screen_y != position[1]:
+            continue
+
+        if found_stim is None:
             found_stim = stim_attrs
 
-            # --- FIXED comprehension: use stim_attrs, not 'each' directly ---
-            filtered = {
-                k: stim_attrs[k]
-                for k in stim_attrs
-                if k not in ('position', 'text', 'vis_delay')
-            }
+        # --- FIXED comprehension: use stim_attrs, not 'each' directly ---
+        filtered = {
+            k: stim_attrs[k]
+            for k in stim_attrs
+            if k not in ('position', 'text', 'vis_delay')
+        }
+        try:
+            key = tuple(sorted(filtered.items()))
+            known = key in subsumption
+        except TypeError:
+            # Nicht vergleichbare oder nicht hashbare Werte, z.B. Listen
+            key, known = ordinal, False
+        if not known:
             visible_chunk = chunks.makechunk(
                 nameofchunk="vis1",
                 typename="_visuallocation",
                 **filtered
             )
-
             # Compare chunk to search criteria
-            if visible_chunk <= chunk_used_for_search:
-                temp_dict = visible_chunk._asdict()
-                temp_dict.update({"screen_x": position[0], "screen_y": position[1]})
-                found = chunks.Chunk(utilities.VISUALLOCATION, **temp_dict)
+            subsumption[key] = (visible_chunk, visible_chunk <= chunk_used_for_search)
+        visible_chunk, matches = subsumption[key]
+
+        if matches:
+            temp_dict = visible_chunk._asdict()
+            temp_dict.update({"screen_x": position[0], "screen_y": position[1]})
+            found = chunks.Chunk(utilities.VISUALLOCATION, **temp_dict)
+            break
+
+    return found, found_stim
+
 
-                # Update current-closeness metrics
-                closest = utilities.calculate_pythagorean_distance(self.environment.current_focus, position)
-                x_closest = utilities.calculate_onedimensional_distance(self.environment.current_focus, position,
-                                                                        horizontal=True)
-                y_closest = utilities.calculate_onedimensional_distance(self.environment.current_focus, position,
-                                                                        horizontal=False)
+def fix_pyactr():
+    """
+    Overrides pyactr visual class. There's an issue with attending objects & Chunk information especially with automatic visual search set to True
+    Environment.output is patched as well, so the stimulus index used by the visual search is dropped with every new
+    frame. The patches are installed once when this module is imported, calling this function again does nothing.
+    """
+    install_patch(vision.VisualLocation, "find", patched_find)
+    install_patch(actr.Environment, "output", patched_output)
 
-        return found, found_stim
 
-    # Apply patch
-    vision.VisualLocation.find = patched_find
+fix_pyactr()
+
 
 def production_fired(agent):
     event = agent.simulation.current_event
@@ -207,37 +317,18 @@ def check_location_damage(agent):
     Returns:
         bool oder None: True/False, wenn eine Location gefunden wurde, sonst None.
     """
-    matrix = agent.middleman.experiment_environment.level_matrix
-    r, c = agent.middleman.experiment_environment.find_agent(agent)
-    if r is None:
+    game = agent.middleman.experiment_environment
+    window = _visible_window(game, agent)
+    if window is None:
         return None
+    r0, r1, c0, c1 = window
 
-    rows, cols = len(matrix), len(matrix[0])
-    los = agent.los
-
-    # Falls los = 0 oder größer als die Kartenmaße, betrachten wir die gesamte Karte
-    if los == 0 or los > rows or los > cols:
-        off_x = off_y = 0
-        x_los, y_los = cols, rows
-    else:
-        off_x = off_y = los
-        x_los = y_los = 2 * los + 1
-
-    for i in range(y_los):
-        for j in range(x_los):
-            mi = r - off_y + i
-            mj = c - off_x + j
-
-            # außerhalb der Karte überspringen
-            if mi < 0 or mi >= rows or mj < 0 or mj >= cols:
-                continue
-
-            # Prüfen, ob in dieser Zelle ein Location-Objekt liegt
-            for element in matrix[mi][mj]:
-                if isinstance(element, Location):
-                    return element.damaged
-
-    return None
+    # Erste Location in Zeilenreihenfolge innerhalb des Sichtfelds
+    locations = np.argwhere(game.terrain[r0:r1, c0:c1] == LOCATION)
+    if not len(locations):
+        return None
+    mi, mj = r0 + int(locations[0][0]), c0 + int(locations[0][1])
+    return game.world.location_at(mi, mj).damaged
 
 def agents_in_sight(agent):
     """
@@ -251,36 +342,33 @@ def agents_in_sight(agent):
     Returns:
         list[AgentConstruct] or None: Liste gefundener Agenten oder None.
     """
-    matrix = agent.middleman.experiment_environment.level_matrix
-    r, c = agent.middleman.experiment_environment.find_agent(agent)
-    if r is None:
+    game = agent.middleman.experiment_environment
+    window = _visible_window(game, agent)
+    if window is None:
         return None
-
-    rows, cols = len(matrix), len(matrix[0])
-    los = agent.los
-
-    # Bereiche festlegen (bei los=0 bzw. los>Dimension gesamte Karte)
-    if los == 0 or los > rows or los > cols:
-        off_x = off_y = 0
-        x_los, y_los = cols, rows
-    else:
-        off_x = off_y = los
-        x_los = y_los = 2 * los + 1
+    r0, r1, c0, c1 = window
 
     found_agents = []
 
-    for i in range(y_los):
-        for j in range(x_los):
-            mi = r - off_y + i
-            mj = c - off_x + j
+    # Nur belegte Zellen nach weiteren Agents durchsuchen
+    for i, j in np.argwhere(game.occupancy[r0:r1, c0:c1] > 0).tolist():
+        for element in game.world.agents_at(r0 + i, c0 + j):
+            if element is not agent:
+                found_agents.append(element)
 
-            # Zelle außerhalb überspringen
-            if mi < 0 or mi >= rows or mj < 0 or mj >= cols:
-                continue
+    return found_agents if found_agents else None
+
+def _visible_window(game, agent):
+    """
+    Sichtfeld des Agenten, auf die Karte beschnitten (bei los=0 bzw. los>Dimension gesamte Karte).
 
-            # In dieser Zelle nach weiteren Agents suchen
-            for element in matrix[mi][mj]:
-                if isinstance(element, AgentConstruct) and element is not agent:
-                    found_agents.append(element)
+    Returns:
+        tuple oder None: (r0, r1, c0, c1) als Slice-Grenzen, None wenn der Agent nicht auf der Karte ist
+    """
+    r, c = game.find_agent(agent)
+    if r is None:
+        return None
 
-    return found_agents if found_agents else None
\ No newline at end of file
+    rows, cols = game.terrain.shape
+    top, left, height, width = game.field_of_view(r, c, agent.los)
+    return max(top, 0), min(top + height, rows), max(left, 0), min(left + width, cols)
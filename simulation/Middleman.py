@@ -1,8 +1,6 @@
-from simulation.Food import Food
-from simulation.Wall import Wall
-from simulation.Water import Water
-from simulation.Location import Location
-from simulation.AgentConstruct import AgentConstruct
+import numpy as np
+from simulation.WorldStore import EMPTY, TERRAIN_SYMBOLS
+from simulation.GameOver import GameOver
 
 class Middleman:
     """
@@ -76,6 +74,7 @@ class Middleman:
     def get_agent_stimulus(self, agent):
         """
         Creates new visual stimuli based on the environment, the agent's ID map, and its field of view.
+        The field of view is read as a slice of the terrain and occupancy layers of the Game.
 
         Args:
             agent (AgentConstruct): the cognitive active agent
@@ -85,92 +84,51 @@ class Middleman:
             stimuli (list of dict): list mit genau einem dict, das fortlaufend
                                     ge-ID-t Stimuli mappt auf {'text', 'position'}
         """
-        matrix = self.experiment_environment.level_matrix
-        r, c = self.experiment_environment.find_agent(agent)
+        game = self.experiment_environment
+        r, c = game.find_agent(agent)
         if r is None:
             return None, None
 
-        agent_map = agent.get_agent_dictionary()
-        rows, cols = len(matrix), len(matrix[0])
-
-        # Field of view
-        los = agent.los
-        rows, cols = len(matrix), len(matrix[0])
-
-        # Wenn los = 0 oder größer als die Grid‐Dimensionen,
-        # verwenden wir die komplette Karte als Sichtfeld:
-        if los == 0 or los > cols or los > rows:
-            x_los = cols
-            y_los = rows
-            off_x = off_y = 0
-        else:
-            # Fenstergröße = (2*los + 1) in jeder Richtung
-            x_los = y_los = 2 * los + 1
-            # Offset = los, damit Agent genau in der Mitte landet
-            off_x = off_y = los
+        agent_symbols = agent.agent_symbols
+        rows, cols = game.terrain.shape
+
+        # Field of view, bei los = 0 oder größer als die Grid‐Dimensionen die komplette Karte
+        top, left, y_los, x_los = game.field_of_view(r, c, agent.los)
+
+        # Ausschnitt, der innerhalb der Karte liegt
+        r0, r1 = max(top, 0), min(top + y_los, rows)
+        c0, c1 = max(left, 0), min(left + x_los, cols)
+        terrain = game.terrain[r0:r1, c0:c1]
+        occupancy = game.occupancy[r0:r1, c0:c1]
+
+        # außerhalb der Karte '-', sonst das Symbol des Terrains
+        visual_stimuli = np.full((y_los, x_los), '-', dtype=object)
+        visual_stimuli[r0 - top:r1 - top, c0 - left:c1 - left] = TERRAIN_SYMBOLS[terrain]
 
         new_triggers = []
         frame = {}
-        visual_stimuli = [['' for _ in range(x_los)] for _ in range(y_los)]
-
         index = 0
-        for i in range(y_los):
-            for j in range(x_los):
-                # Karte‐Koordinate = Agenten‐Zeile − off_y + i, Agenten‐Spalte − off_x + j
-                mi = r - off_y + i
-                mj = c - off_x + j
-
-                # außerhalb der Karte?
-                if mi < 0 or mi >= rows or mj < 0 or mj >= cols:
-                    visual_stimuli[i][j] = '-'
-                    continue
-
-                # Ansonsten: alle Objekte in matrix[mi][mj] betrachten
-                for element in matrix[mi][mj]:
-                    if isinstance(element, AgentConstruct):
-                        # Agenten‐Symbol aus agent_map holen
-                        for sym, info in agent_map.items():
-                            if info["agent"] == element:
-                                new_triggers.append(sym)
-                                frame[index] = {
-                                    "text": sym,
-                                    "position": (mi, mj)
-                                }
-                                visual_stimuli[i][j] = sym
-                                index += 1
-                                break
-
-                    elif isinstance(element, Food):
-                        sym = 'Y'
-                        new_triggers.append(sym)
-                        frame[index] = {
-                            "text": sym,
-                            "position": (mi, mj)
-                        }
-                        visual_stimuli[i][j] = sym
-                        index += 1
-
-                    elif isinstance(element, Location):
-                        sym = 'X'
-                        new_triggers.append(sym)
-                        frame[index] = {
-                            "text": sym,
-                            "position": (mi, mj)
-                        }
-                        visual_stimuli[i][j] = sym
-                        index += 1
-
-                    elif isinstance(element, Wall) or isinstance(element, Water):
-                        sym = 'Z'
-                        new_triggers.append(sym)
-                        frame[index] = {
-                            "text": sym,
-                            "position": (mi, mj)
-                        }
-                        visual_stimuli[i][j] = sym
-                        index += 1
-
-        agent.visual_stimuli = visual_stimuli
+        # Nur Zellen mit Terrain oder Agenten, in Zeilenreihenfolge wie die Matrix
+        for i, j in np.argwhere((terrain != EMPTY) | (occupancy > 0)).tolist():
+            mi, mj = r0 + i, c0 + j
+            symbols = []
+            if terrain[i, j] != EMPTY:
+                symbols.append(TERRAIN_SYMBOLS[terrain[i, j]])
+            if occupancy[i, j] > 0:
+                # Agenten‐Symbole aus agent_map holen, Reihenfolge wie in der Zelle
+                symbols.extend(agent_symbols[element] for element in game.world.agents_at(mi, mj)
+                               if element in agent_symbols)
+
+            for sym in symbols:
+                new_triggers.append(sym)
+                frame[index] = {
+                    "text": sym,
+                    "position": (mi, mj)
+                }
+                visual_stimuli[mi - top, mj - left] = sym
+                index += 1
+
+        agent.visual_stimuli = visual_stimuli.tolist()
         stimuli = [frame]
         return new_triggers, stimuli
 
@@ -198,6 +156,6 @@ class Middleman:
         # 4) Prüfen, ob dessen Name "Imposter" ist
         if other_agent.name == "Imposter":
             # Simulation beenden mit Fehlermeldung
-            raise RuntimeError("YOU WON!!!")
+            raise GameOver("YOU WON!!!", winner="Crew")
         else:
-            raise RuntimeError(f"GAME OVER!!! {other_agent.name} was not the imposter.")
\ No newline at end of file
+            raise GameOver(f"GAME OVER!!! {other_agent.name} was not the imposter.", winner="Imposter")
\ No newline at end of file
@@ -0,0 +1,105 @@
+from collections import OrderedDict, deque
+import numpy as np
+from simulation.WorldStore import WALL, WATER
+
+# Reihenfolge, in der Nachbarn geprüft werden; bei gleich langen Wegen gewinnt die frühere Richtung
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+class Pathing:
+    """
+    Kürzeste Wege auf einem festen Raster. Pro Ziel wird einmal ein BFS-Distanzfeld berechnet und gecacht,
+    danach ist jeder nächste Schritt zu diesem Ziel ein Blick auf die vier Nachbarn.
+    Das Raster ist fest: walkable wird beim Erstellen kopiert, ein anderes Terrain braucht eine neue Instanz.
+
+    Attributes:
+        walkable (np.ndarray): bool pro Zelle, ob sie betreten werden kann
+        max_fields (int): Maximale Anzahl gecachter Distanzfelder, danach fliegt das am längsten unbenutzte raus
+        fields (OrderedDict): (Zeile, Spalte) des Ziels -> Distanzfeld (int32, -1 = unerreichbar)
+    """
+
+    def __init__(self, walkable, max_fields=64):
+        self.walkable = np.array(walkable, dtype=bool)
+        self.max_fields = max_fields
+        self.fields = OrderedDict()
+
+    @classmethod
+    def from_terrain(cls, terrain, max_fields=64):
+        """Walls und Water sind nicht begehbar, alles andere schon."""
+        return cls((terrain != WALL) & (terrain != WATER), max_fields)
+
+    def distance_field(self, goal):
+        """
+        Returns:
+            np.ndarray: Schritte von jeder Zelle bis goal, -1 wenn goal von dort nicht erreichbar ist
+        """
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+            return field
+
+        field = self._bfs(goal)
+        self.fields[goal] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def distance(self, start, goal):
+        """
+        Returns:
+            int: Länge des kürzesten Wegs, None wenn goal unerreichbar ist
+        """
+        d = int(self.distance_field(goal)[start])
+        return d if d >= 0 else None
+
+    def next_step(self, start, goal):
+        """
+        Erster Schritt eines kürzesten Wegs von start nach goal.
+        Entspricht dem ersten Schritt einer Breitensuche ab start mit der Nachbarreihenfolge DIRECTIONS.
+
+        Returns:
+            tuple: (row, col) of the next cell, None if start == goal or goal is unreachable
+        """
+        field = self.distance_field(goal)
+        d = field[start]
+        if d <= 0:
+            return None
+        rows, cols = field.shape
+        r, c = start
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and field[nr, nc] == d - 1:
+                return nr, nc
+        return None
+
+    def reachable(self, start):
+        """
+        Returns:
+            np.ndarray: bool pro Zelle, ob sie von start aus erreichbar ist (start selbst eingeschlossen)
+        """
+        return self.distance_field(start) >= 0
+
+    def _bfs(self, goal):
+        walkable = self.walkable
+        rows, cols = walkable.shape
+        field = np.full((rows, cols), -1, dtype=np.int32)
+        r, c = goal
+        if not (0 <= r < rows and 0 <= c < cols) or not walkable[r, c]:
+            return field
+
+        # Auf Listen statt auf dem Array arbeiten, das ist in der Python-Schleife deutlich schneller
+        open_cells = walkable.tolist()
+        distances = field.tolist()
+        distances[r][c] = 0
+        open_cells[r][c] = False
+        queue = deque([(r, c)])
+        while queue:
+            r, c = queue.popleft()
+            d = distances[r][c] + 1
+            for dr, dc in DIRECTIONS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and open_cells[nr][nc]:
+                    open_cells[nr][nc] = False
+                    distances[nr][nc] = d
+                    queue.append((nr, nc))
+        return np.array(distances, dtype=np.int32)
@@ -1,13 +1,20 @@
 import random
+import threading
+import time
+import numpy as np
 import simpy
 import tkinter as tk
 from gui.Stepper import StepLogWindow
 from simulation import LübeckACTR
 from simulation.Middleman import Middleman
 from simulation.Game import Game
+from simulation.GameOver import GameOver
+from simulation.SimulationResult import SimulationResult
 from simulation.AgentConstruct import AgentConstruct
+from simulation.AgentScheduler import AgentScheduler
 from simulation.AgentTypeReturner import AgentTypeReturner
 import simulation.LevelBuilder as levelbuilder
+import simulation.EpisodeState as episodestate
 import pyactr as actr
 
 
@@ -26,17 +33,29 @@ class Simulation:
         print_agent_actions (bool): If False, turn off all agents internal logging simultaniously
         los (int): How far is the line of sight for the agent. 0 = Infinite
         stepper (bool): If True, run simulation by pressing SPACE step by step
-        agent_type_config (dict): .py Class name of your agent, amount and if you want to display their logs
+        agent_type_config (dict): .py Class name of your agent, amount and if you want to display their logs.
+            Optional "adapter_settings" are set as attributes on each adapter, e.g. {"difficulty": "hard"}
+        headless (bool): If True, no Tk window is created and the episode is run by run_headless
+        seed (int): Seed of the episode. None draws a fresh seed, which is kept so the episode can be replayed
+        jump_refresh_interval (float): Wall-clock seconds between GUI refreshes while jumping, None = only at the end
+        jump_time_budget (float): Wall-clock seconds after which a jump gives up, None = no limit
+        threaded (bool): If True (and not stepper), cognition runs at full speed in a worker thread and the GUI
+            only renders the published world snapshots
 
         global_sim_time (float): Used for synchronising the gui with the cognition time
+        step_count (int): Cognitive steps of the current (or last) run_headless, also if it ended with an exception
         agent_list (list): All agents participating in the simulation
-        root (Tkinter()): GUI of the simulation
+        all_agents (list): Every agent created by agent_builder in creation order, also after being removed
+        scheduler (AgentScheduler): Picks the agent with the lowest actr_time for the next step
+        rng (random.Random): Random generator of the simulation, every other generator is derived from it
+        root (Tkinter()): GUI of the simulation, None in headless runs
         agent_type_returner (AgentTypeReturner): Returns the actr agent and its Adapter
         actr_environment (pyactr.Environment()): Environment in which the visual stimuli will appear
         middleman (Middleman): Translates changes between the environment and the agents
+        game_environment (Game): The matrix environment, created by build_episode
     """
 
-    def __init__(self, interceptor):
+    def __init__(self, interceptor, headless=False):
         # Configuration
         self.level_type = "Agent Project"
         self.focus_position = (0, 2)
@@ -49,6 +68,11 @@ class Simulation:
         self.print_agent_actions = True
         self.los = 3
         self.stepper = True
+        self.headless = headless
+        self.seed = None
+        self.jump_refresh_interval = 0.5
+        self.jump_time_budget = 60
+        self.threaded = False
         self.agent_type_config = {
             "Imposter": {"count": 1, "pokedex_id": 647, "print_agent_actions": False},
             "Chatot": {"count": 1, "pokedex_id": 441, "print_agent_actions": True},  # Tom
@@ -59,34 +83,43 @@ class Simulation:
 
         # Critical state
         self.global_sim_time = 0
+        self.step_count = 0
         self.agent_list = []
+        self.all_agents = []
+        self.scheduler = None
+        self.rng = None
         self.interceptor = interceptor
+        self.game_environment = None
+        self.worker = None
 
         # Agent & ACT-R environment setup (für agent_builder)
         self.agent_type_returner = AgentTypeReturner()
         self.actr_environment = actr.Environment(focus_position=self.focus_position)
         self.middleman = Middleman(self, self.print_middleman)
 
-        # GUI setup
-        self.root = tk.Tk()
-        if self.stepper:
-            self.root.bind("<space>", lambda e: self.step_once())
+        # GUI setup (headless runs don't need Tk)
+        self.root = None
+        if not self.headless:
+            self.root = tk.Tk()
+        if self.stepper and not self.headless:
+            self.root.bind("<space>", lambda e: None if self.jumping else self.step_once())
             self.log_window = StepLogWindow(
                 master=self.root,
                 tracer=self.interceptor,
                 simulation=self
             )
 
-        # Jump-State
+        # Jump-State, suppress_gui unterdrückt die Refreshes pro Schritt während eines Jumps
         self.jumping = False
         self.jump_target = None
+        self.suppress_gui = False
 
     def agent_builder(self):
         """Creates all agent objects with its components."""
         with open("gui/sprites/pokemon/pokemonNames.txt", 'r') as file:
             names = file.read().splitlines()
         original_names = names.copy()
-        random.shuffle(names)
+        self.rng.shuffle(names)
 
         for agent_type, config in self.agent_type_config.items():
             count = config["count"]
@@ -112,25 +145,67 @@ class Simulation:
                 )
                 agent.actr_time = 0
                 agent.print_agent_actions = print_actions
+                agent.rng = random.Random(self.rng.getrandbits(64))
                 self.agent_list.append(agent)
+        self.all_agents = list(self.agent_list)
 
         for agent in self.agent_list:
             agent.set_agent_dictionary(self.agent_list)
             ids = list(agent.get_agent_dictionary())
-            actr_construct, actr_agent, actr_adapter = (
-                AgentTypeReturner()
-                .return_agent_type(
-                    agent.actr_agent_type_name,
-                    self.actr_environment,
-                    ids
-                )
+            actr_construct, actr_agent, actr_adapter = self.agent_type_returner.return_agent_type(
+                agent.actr_agent_type_name,
+                self.actr_environment,
+                ids
             )
             agent.set_actr_agent(actr_agent)
             agent.set_actr_adapter(actr_adapter)
+            adapter_settings = self.agent_type_config[agent.actr_agent_type_name].get("adapter_settings", {})
+            for attribute, value in adapter_settings.items():
+                setattr(actr_adapter, attribute, value)
             agent.set_simulation()
             agent.set_actr_construct(actr_construct)
 
-    def run_simulation(self):
+    def seed_random_generators(self):
+        """Seeds every random generator of the episode from self.seed, so the episode can be replayed."""
+        if self.seed is None:
+            self.seed = random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        # Für Adapter, die noch das globale random benutzen
+        random.seed(self.seed)
+        # pyactr zieht sein Rauschen (Utility, Motor, Vision) aus dem globalen numpy Generator
+        np.random.seed(self.seed % 2 ** 32)
+
+    def branch(self, branch_seed):
+        """
+        Reseeds every random generator, e.g. after restore(), so continuations of the same snapshot diverge.
+        self.seed stays the seed of the original episode.
+        """
+        self.rng = random.Random(branch_seed)
+        random.seed(branch_seed)
+        np.random.seed(branch_seed % 2 ** 32)
+        for agent in self.all_agents:
+            agent.rng = random.Random(self.rng.getrandbits(64))
+
+    def snapshot(self):
+        """
+        Captures the state of the running episode: world, cage, times, buffers, declarative memories and the
+        picklable adapter attributes. See simulation.EpisodeState.
+
+        Returns:
+            bytes: zlib-compressed snapshot, which can be sent to other processes and passed to restore()
+        """
+        return episodestate.capture(self)
+
+    def restore(self, data):
+        """
+        Continues from a snapshot of snapshot(). A Simulation without an episode builds it from the snapshot's
+        configuration first. Every agent gets a fresh pyactr simulation, like after reset_simulation.
+        """
+        episodestate.restore(self, data)
+
+    def build_episode(self):
+        """Creates the agents, the level and the game environment. Headless runs get no GUI."""
+        self.seed_random_generators()
         self.agent_builder()
         level_matrix = levelbuilder.build_level(
             self.height,
@@ -138,11 +213,21 @@ class Simulation:
             self.agent_list,
             self.food_amount,
             self.wall_density,
-            self.level_type
+            self.level_type,
+            self.rng
         )
         self.game_environment = Game(self.root, level_matrix)
         self.middleman.set_game_environment(self.game_environment)
-        if not self.stepper:
+        # Level builders may drop agents, so the scheduler is filled afterwards
+        self.scheduler = AgentScheduler(self.agent_list)
+
+    def run_simulation(self):
+        self.build_episode()
+        if self.threaded and not self.stepper:
+            # Tk bleibt im Hauptthread und holt sich nur die Snapshots ab
+            self.worker = threading.Thread(target=self.run_headless, daemon=True)
+            self.worker.start()
+        elif not self.stepper:
             self.execute_step()
 
         self.root.mainloop()
@@ -155,9 +240,9 @@ class Simulation:
         for agent in self.agent_list:
             agent.update_stimulus()
 
-        LübeckACTR.fix_pyactr()
-        self.agent_list.sort(key=lambda a: a.actr_time)
-        next_agent = self.agent_list[0]
+        next_agent = self.scheduler.peek()
+        if next_agent is None:
+            return
         delay = next_agent.actr_time - self.global_sim_time
         factor = 100 / self.speed_factor
         ms = max(1, round(delay * factor * 1000))
@@ -165,6 +250,17 @@ class Simulation:
 
     def execute_agent_step(self, agent):
         """Executes a cognitive step and handles errors."""
+        try:
+            self.cognitive_step(agent)
+            self.execute_step()
+
+        except (simpy.core.EmptySchedule, AttributeError, IndexError, RuntimeError) as e:
+            print(f"Error in {agent.name}: {e}")
+            agent.handle_empty_schedule()
+            self.root.after_idle(lambda: self.execute_step())
+
+    def cognitive_step(self, agent):
+        """Runs one ACT-R step of the agent and forwards its motor output to the environment."""
         try:
             agent.simulation.step()
             event = agent.simulation.current_event
@@ -177,32 +273,89 @@ class Simulation:
             if agent.no_increase_count >= 10:
                 print(f"{agent.name} removed due to inactivity.")
                 self.agent_list.remove(agent)
+                self.scheduler.remove(agent)
                 self.game_environment.remove_agent_from_game(agent)
             else:
                 agent.actr_time += event.time
                 self.global_sim_time = agent.actr_time
                 agent.actr_extension()
+                self.scheduler.reschedule(agent)
                 if agent.print_agent_actions:
                     print(f"{agent.name}, {agent.actr_time}, {event}")
                 key = LübeckACTR.key_pressed(agent)
                 if key:
                     self.middleman.motor_input(key, agent)
+        finally:
+            # Auch bei GameOver, sonst zeichnet die GUI den Schritt nicht mehr, der das Spiel beendet hat
+            self.game_environment.publish_snapshot(self.global_sim_time)
 
-            self.execute_step()
+    def run_headless(self, max_sim_time=None, max_steps=None):
+        """
+        Runs an episode without Tk in a tight loop. Uses the same cognitive step as execute_agent_step, but
+        without the speed_factor delay.
 
-        except (simpy.core.EmptySchedule, AttributeError, IndexError, RuntimeError) as e:
-            print(f"Error in {agent.name}: {e}")
-            agent.handle_empty_schedule()
-            self.root.after_idle(lambda: self.execute_step())
+        Args:
+            max_sim_time (float): Budget in simulated seconds, None for no limit
+            max_steps (int): Budget in cognitive steps, None for no limit
+
+        Returns:
+            SimulationResult: Winner, reason for the end, end time and amount of steps
+        """
+        if self.game_environment is None:
+            self.build_episode()
+
+        self.step_count = 0
+        winner = None
+        reason = "no_agents"
+        while self.agent_list:
+            if max_steps is not None and self.step_count >= max_steps:
+                reason = "step_budget"
+                break
+
+            for agent in self.agent_list:
+                agent.update_stimulus()
+
+            next_agent = self.scheduler.peek()
+            if max_sim_time is not None and next_agent.actr_time >= max_sim_time:
+                reason = "time_budget"
+                break
+
+            self.step_count += 1
+            try:
+                self.cognitive_step(next_agent)
+            except GameOver as e:
+                winner = e.winner
+                reason = "game_over"
+                break
+            except (simpy.core.EmptySchedule, AttributeError, IndexError, RuntimeError) as e:
+                print(f"Error in {next_agent.name}: {e}")
+                next_agent.handle_empty_schedule()
+
+        return SimulationResult(
+            winner,
+            reason,
+            self.global_sim_time,
+            self.step_count,
+            self.game_environment.sabotage_count,
+            self.game_environment.repair_count,
+            self.seed,
+            {agent.name: agent.reset_count for agent in self.all_agents}
+        )
 
     def step_once(self):
-        """Performs exactly one cognitive step (stepper mode)."""
+        """
+        Performs exactly one cognitive step (stepper mode).
+
+        Returns:
+            The traced ACT-R event of the step, None if nothing was traced
+        """
         for agent in self.agent_list:
             agent.update_stimulus()
 
-        LübeckACTR.fix_pyactr()
-        self.agent_list.sort(key=lambda a: a.actr_time)
-        na = self.agent_list[0]
+        na = self.scheduler.peek()
+        if na is None:
+            return None
+        traced = None
         try:
             na.simulation.step()
             event = na.simulation.current_event
@@ -214,48 +367,80 @@ class Simulation:
             if na.no_increase_count >= 10:
                 print(f"{na.name} removed due to inactivity.")
                 self.agent_list.remove(na)
+                self.scheduler.remove(na)
                 self.game_environment.remove_agent_from_game(na)
             else:
                 na.actr_time += event.time
                 self.global_sim_time = na.actr_time
                 na.actr_extension()
+                self.scheduler.reschedule(na)
                 if na.print_agent_actions:
                     print(f"{na.name}, {na.actr_time}, {event}")
                 key = LübeckACTR.key_pressed(na)
                 if key:
                     self.middleman.motor_input(key, na)
                 self.interceptor.trace(na, event)
-                self.log_window.log()
+                traced = event
+                if not self.suppress_gui:
+                    self.log_window.log()
 
         except (simpy.core.EmptySchedule, AttributeError, IndexError, RuntimeError) as e:
             print(f"Error in step_once for {na.name}: {e}")
             na.handle_empty_schedule()
+            if isinstance(e, GameOver):
+                # Ein Jump würde sonst bis zum Zeitbudget weiterlaufen
+                self.jumping = False
         finally:
+            self.game_environment.publish_snapshot(self.global_sim_time)
             self.notify_gui()
+        return traced
 
     def start_jump(self, production_name: str):
-        """Starts jumping until the specified production fires (only in stepper mode)."""
-        if not self.stepper:
+        """
+        Steps in a tight loop until the specified production fires (only in stepper mode).
+        The GUI is only refreshed every jump_refresh_interval seconds and redrawn once at the end.
+        """
+        if not self.stepper or self.jumping:
             # Jump only available when stepper is active
             return
         self.jumping = True
         self.jump_target = f"RULE FIRED: {production_name}"
-        self._jump_step()
 
-    def _jump_step(self):
-        if not getattr(self, 'jumping', False):
-            return
-        before = len(self.interceptor.records)
-        self.step_once()
-        for r in self.interceptor.records[before:]:
-            if r.get('type') == 'PROCEDURAL' and str(r.get('event')) == self.jump_target:
-                self.jumping = False
-                print(f"✅ Jump completed to {self.jump_target}")
-                return
-        self.root.after(1, self._jump_step)
+        started = time.perf_counter()
+        next_refresh = None if self.jump_refresh_interval is None else started + self.jump_refresh_interval
+        self.suppress_gui = True
+        try:
+            while self.jumping and self.agent_list:
+                event = self.step_once()
+                if event is not None and event[1] == 'PROCEDURAL' and str(event[2]) == self.jump_target:
+                    print(f"✅ Jump completed to {self.jump_target}")
+                    break
+
+                now = time.perf_counter()
+                if self.jump_time_budget is not None and now - started >= self.jump_time_budget:
+                    print(f"Jump to {self.jump_target} stopped after {self.jump_time_budget}s")
+                    break
+                if next_refresh is not None and now >= next_refresh:
+                    self.refresh_gui()
+                    next_refresh = now + self.jump_refresh_interval
+        finally:
+            self.jumping = False
+            self.suppress_gui = False
+            self.refresh_gui()
+
+    def refresh_gui(self):
+        """Redraws the stepper log and lets Tk process pending redraws, also while GUI refreshes are suppressed."""
+        suppressed = self.suppress_gui
+        self.suppress_gui = False
+        if hasattr(self, 'log_window'):
+            self.log_window.log()
+        self.notify_gui()
+        self.suppress_gui = suppressed
 
     def notify_gui(self):
         """Refreshes GUI elements."""
+        if self.suppress_gui:
+            return
         if hasattr(self, 'log_window'):
             self.log_window.window.update_idletasks()
             self.log_window.window.update()
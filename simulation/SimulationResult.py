@@ -0,0 +1,41 @@
+class SimulationResult:
+    """
+    Outcome of a headless episode.
+
+    Attributes:
+        winner (str): "Imposter", "Crew" or None if the episode was not decided
+        reason (str): Why the episode ended ("game_over", "time_budget", "step_budget", "no_agents")
+        end_time (float): Global simulation time when the episode ended
+        steps (int): Amount of executed cognitive steps
+        sabotages (int): Successful sabotages during the episode
+        repairs (int): Successful repairs during the episode
+        seed (int): Seed of the episode, rerunning with it replays the episode
+        resets (dict): Agent name → how often its ACT-R simulation was reset (empty schedule or caught errors)
+    """
+
+    def __init__(self, winner, reason, end_time, steps, sabotages=0, repairs=0, seed=None, resets=None):
+        self.winner = winner
+        self.reason = reason
+        self.end_time = end_time
+        self.steps = steps
+        self.sabotages = sabotages
+        self.repairs = repairs
+        self.seed = seed
+        self.resets = resets if resets is not None else {}
+
+    def to_dict(self):
+        return {
+            "winner": self.winner,
+            "reason": self.reason,
+            "end_time": self.end_time,
+            "steps": self.steps,
+            "sabotages": self.sabotages,
+            "repairs": self.repairs,
+            "seed": self.seed,
+            "resets": self.resets
+        }
+
+    def __repr__(self):
+        return (f"SimulationResult(winner={self.winner!r}, reason={self.reason!r}, "
+                f"end_time={self.end_time}, steps={self.steps}, sabotages={self.sabotages}, repairs={self.repairs}, seed={self.seed}, "
+                f"resets={self.resets})")
@@ -0,0 +1,39 @@
+import threading
+
+
+class SnapshotQueue:
+    """
+    Latest-only Übergabe von WorldSnapshots von der Simulation an die GUI.
+    Holt die GUI einen Snapshot nicht rechtzeitig ab, wird er vom nächsten ersetzt. Seine geänderten Zellen
+    werden aber gesammelt, damit die GUI beim nächsten Frame nichts verpasst.
+
+    Attributes:
+        published (int): Anzahl veröffentlichter Snapshots
+        dropped (int): Anzahl Snapshots, die ersetzt wurden, bevor die GUI sie abgeholt hat
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = None
+        self._changed = set()
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, snapshot):
+        with self._lock:
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = snapshot
+            self._changed |= snapshot.changed
+            self.published += 1
+
+    def take(self):
+        """
+        Returns:
+            tuple: (neuester Snapshot oder None, alle seit dem letzten take geänderten Zellen)
+        """
+        with self._lock:
+            snapshot, changed = self._latest, self._changed
+            self._latest = None
+            self._changed = set()
+        return snapshot, changed
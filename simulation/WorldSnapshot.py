@@ -0,0 +1,39 @@
+from types import MappingProxyType
+
+
+class WorldSnapshot:
+    """
+    Unveränderlicher Zustand der Welt, den Game nach jedem Schritt veröffentlicht und die GUI zeichnet.
+    Die GUI liest nur aus Snapshots, deshalb kann die Simulation in einem anderen Thread laufen.
+
+    Attributes:
+        version (int): Game.version zum Zeitpunkt des Snapshots
+        sim_time (float): Simulationszeit beim Veröffentlichen
+        cells (tuple): Zeilen (Tupel) von Zellen (Tupel der Objekte), unveränderte Zeilen teilt er mit dem Vorgänger
+        damaged (frozenset): (Zeile, Spalte) aller beschädigten Locations
+        agent_positions (MappingProxyType): Agent → (Zeile, Spalte)
+        changed (frozenset): Zellen, die sich seit dem vorherigen Snapshot geändert haben
+        food (MappingProxyType): (Zeile, Spalte) → (saturation, amount, time_till_regrowth) des Foods dort
+        visual_stimuli (MappingProxyType): Agent → zuletzt wahrgenommene visual_stimuli als Tupel von Zeilen
+    """
+
+    def __init__(self, version, sim_time, cells, damaged, agent_positions, changed, food, visual_stimuli):
+        self.version = version
+        self.sim_time = sim_time
+        self.cells = cells
+        self.damaged = damaged
+        self.agent_positions = MappingProxyType(agent_positions)
+        self.changed = changed
+        self.food = MappingProxyType(food)
+        self.visual_stimuli = MappingProxyType(visual_stimuli)
+
+    @property
+    def shape(self):
+        return len(self.cells), len(self.cells[0])
+
+    def find_agent(self, agent):
+        """
+        Returns:
+            tuple: (row, col) of the agent, (None, None) if it's not part of the game
+        """
+        return self.agent_positions.get(agent, (None, None))
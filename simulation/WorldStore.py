@@ -0,0 +1,152 @@
+import numpy as np
+from simulation.Food import Food
+from simulation.Wall import Wall
+from simulation.Water import Water
+from simulation.Location import Location
+from simulation.AgentConstruct import AgentConstruct
+
+# Codes of the terrain layer and the visual symbol of each code
+EMPTY, WALL, WATER, LOCATION, FOOD = range(5)
+TERRAIN_SYMBOLS = np.array(['', 'Z', 'Z', 'X', 'Y'], dtype=object)
+
+# Walls und Water haben keinen Zustand, in der Matrix-Sicht stehen alle für dieselbe Instanz
+WALL_OBJECT = Wall()
+WATER_OBJECT = Water()
+
+
+class WorldStore:
+    """
+    Kompakte Speicherung der Spielwelt: Terrain als uint8-Ebene, Locations in einer kleinen Tabelle,
+    Food und Agenten nur für belegte Zellen. Walls und Water sind keine eigenen Objekte mehr.
+
+    Attributes:
+        terrain (np.ndarray): uint8 Terrain-Code pro Zelle (EMPTY, WALL, WATER, LOCATION, FOOD)
+        occupancy (np.ndarray): Anzahl der Agenten pro Zelle
+        location_ids (np.ndarray): Index in locations pro Zelle, -1 ohne Location
+        locations (list): Location-Tabelle, das damaged-Flag steht am Location-Objekt
+        location_coords (list): (Zeile, Spalte) jeder Location, parallel zu locations
+        damaged_count (int): Anzahl der beschädigten Locations, wird von set_damaged mitgeführt
+        food (dict): (Zeile, Spalte) → Food
+        agents (dict): (Zeile, Spalte) → Liste der Agenten in der Zelle, in Ankunftsreihenfolge
+    """
+
+    def __init__(self, level_matrix):
+        """
+        Args:
+            level_matrix: 2D-Liste des LevelBuilders, pro Zelle None, ein Objekt oder eine Liste von Objekten
+        """
+        rows, cols = len(level_matrix), len(level_matrix[0])
+        self.terrain = np.full((rows, cols), EMPTY, dtype=np.uint8)
+        self.occupancy = np.zeros((rows, cols), dtype=np.int16)
+        self.location_ids = np.full((rows, cols), -1, dtype=np.int32)
+        self.locations = []
+        self.location_coords = []
+        self.damaged_count = 0
+        self.food = {}
+        self.agents = {}
+
+        for r, row in enumerate(level_matrix):
+            for c, cell in enumerate(row):
+                for obj in cell if isinstance(cell, list) else (cell,):
+                    if isinstance(obj, AgentConstruct):
+                        self.place_agent(obj, r, c)
+                    elif isinstance(obj, Wall):
+                        self.terrain[r, c] = WALL
+                    elif isinstance(obj, Water):
+                        self.terrain[r, c] = WATER
+                    elif isinstance(obj, Location):
+                        self.terrain[r, c] = LOCATION
+                        self.location_ids[r, c] = len(self.locations)
+                        self.locations.append(obj)
+                        self.location_coords.append((r, c))
+                        if obj.damaged:
+                            self.damaged_count += 1
+                    elif isinstance(obj, Food):
+                        self.terrain[r, c] = FOOD
+                        self.food[(r, c)] = obj
+
+    @property
+    def shape(self):
+        return self.terrain.shape
+
+    def location_at(self, r, c):
+        """
+        Returns:
+            Location: the location in the cell, None if there is none
+        """
+        location_id = self.location_ids[r, c]
+        return self.locations[location_id] if location_id >= 0 else None
+
+    def set_damaged(self, r, c, damaged):
+        """
+        Setzt das damaged-Flag der Location in der Zelle und führt damaged_count mit.
+        Locations sollten nur hierüber beschädigt oder repariert werden, sonst stimmt der Zähler nicht mehr.
+
+        Returns:
+            bool: True, if the cell holds a location and its flag changed
+        """
+        location = self.location_at(r, c)
+        if location is None or location.damaged == damaged:
+            return False
+        location.damaged = damaged
+        self.damaged_count += 1 if damaged else -1
+        return True
+
+    @property
+    def all_damaged(self):
+        """True, wenn jede Location beschädigt ist (und es überhaupt Locations gibt), in O(1)."""
+        return bool(self.locations) and self.damaged_count == len(self.locations)
+
+    def undamaged_locations(self):
+        """
+        Returns:
+            list: (row, col) of every intact location, in the order of the location table (row-major)
+        """
+        return [coords for location, coords in zip(self.locations, self.location_coords) if not location.damaged]
+
+    def agents_at(self, r, c):
+        """
+        Returns:
+            list: agents in the cell in arrival order, the stored list itself (do not modify)
+        """
+        return self.agents.get((r, c), [])
+
+    def cell(self, r, c):
+        """
+        Baut den Zellinhalt im Format der alten level_matrix: erst das Terrain-Objekt, dann die Agenten.
+
+        Returns:
+            list: new list of the objects in the cell
+        """
+        code = self.terrain[r, c]
+        if code == EMPTY:
+            objects = []
+        elif code == WALL:
+            objects = [WALL_OBJECT]
+        elif code == WATER:
+            objects = [WATER_OBJECT]
+        elif code == LOCATION:
+            objects = [self.locations[self.location_ids[r, c]]]
+        else:
+            objects = [self.food[(r, c)]]
+        agents = self.agents.get((r, c))
+        if agents:
+            objects.extend(agents)
+        return objects
+
+    def place_agent(self, agent, r, c):
+        self.agents.setdefault((r, c), []).append(agent)
+        self.occupancy[r, c] += 1
+
+    def remove_agent(self, agent, r, c):
+        """
+        Raises:
+            ValueError: if the agent is not in the cell
+        """
+        agents = self.agents.get((r, c))
+        if not agents:
+            raise ValueError(f"{agent} is not in cell ({r}, {c})")
+        agents.remove(agent)
+        if not agents:
+            del self.agents[(r, c)]
+        self.occupancy[r, c] -= 1
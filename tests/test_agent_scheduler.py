@@ -0,0 +1,91 @@
+import random
+
+from simulation.AgentScheduler import AgentScheduler
+
+
+class Agent:
+    def __init__(self, name, actr_time=0):
+        self.name = name
+        self.actr_time = actr_time
+
+    def __repr__(self):
+        return f"Agent({self.name}, {self.actr_time})"
+
+
+def test_added_agents_keep_their_order_on_ties():
+    agents = [Agent(name) for name in "abc"]
+    scheduler = AgentScheduler(agents)
+    assert scheduler.ordered() == agents
+    assert scheduler.peek() is agents[0]
+
+
+def test_rescheduled_agent_goes_before_equal_times():
+    a, b, c = Agent("a"), Agent("b"), Agent("c")
+    scheduler = AgentScheduler([a, b, c])
+
+    a.actr_time = 1
+    scheduler.reschedule(a)
+    assert scheduler.peek() is b
+
+    b.actr_time = 1
+    scheduler.reschedule(b)
+    c.actr_time = 1
+    scheduler.reschedule(c)
+    # c ist zuletzt gelaufen und steht damit vorne, wie nach dem stabilen Sortieren der Agentenliste
+    assert scheduler.ordered() == [c, b, a]
+    assert scheduler.peek() is c
+
+
+def test_outdated_entry_is_corrected_on_peek():
+    a, b = Agent("a"), Agent("b", 1)
+    scheduler = AgentScheduler([a, b])
+    a.actr_time = 2  # ohne reschedule
+    assert scheduler.peek() is b
+    assert scheduler.ordered() == [b, a]
+
+
+def test_removed_agent_is_skipped():
+    a, b = Agent("a"), Agent("b", 1)
+    scheduler = AgentScheduler([a, b])
+    scheduler.remove(a)
+    assert a not in scheduler
+    assert len(scheduler) == 1
+    assert scheduler.peek() is b
+    scheduler.remove(b)
+    assert scheduler.peek() is None
+
+
+def test_matches_stable_sort_of_the_agent_list():
+    # Vorher wurde die Agentenliste vor jedem Schritt stabil nach actr_time sortiert und der erste Agent lief
+    rng = random.Random(7)
+    for _ in range(20):
+        agents = [Agent(i) for i in range(6)]
+        agent_list = list(agents)
+        scheduler = AgentScheduler(agents)
+        for _ in range(200):
+            agent_list.sort(key=lambda agent: agent.actr_time)
+            expected = agent_list[0]
+            assert scheduler.peek() is expected
+            # ganzzahlige Schritte, damit häufig Gleichstände entstehen
+            expected.actr_time += rng.choice((0, 1, 1, 2))
+            scheduler.reschedule(expected)
+        agent_list.sort(key=lambda agent: agent.actr_time)
+        assert scheduler.ordered() == agent_list
+
+
+def test_ordered_rebuilds_the_same_schedule():
+    rng = random.Random(3)
+    agents = [Agent(i) for i in range(5)]
+    scheduler = AgentScheduler(agents)
+    for _ in range(50):
+        agent = scheduler.peek()
+        agent.actr_time += rng.choice((0, 1))
+        scheduler.reschedule(agent)
+
+    rebuilt = AgentScheduler(scheduler.ordered())
+    for _ in range(50):
+        agent = scheduler.peek()
+        assert rebuilt.peek() is agent
+        agent.actr_time += rng.choice((0, 1))
+        scheduler.reschedule(agent)
+        rebuilt.reschedule(agent)
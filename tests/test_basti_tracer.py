@@ -0,0 +1,110 @@
+import csv
+
+import pytest
+
+from simulation.BastiTracer import BastiTracer
+
+
+class Agent:
+    def __init__(self, name, actr_time=0.0):
+        self.name = name
+        self.actr_time = actr_time
+
+
+def trace(tracer, agent, event, typ="PROCEDURAL"):
+    tracer.trace(agent, (agent.actr_time, typ, event))
+
+
+def events(tracer):
+    return [record["event"] for record in tracer.records]
+
+
+def test_unbounded_tracer_keeps_everything():
+    tracer = BastiTracer()
+    agent = Agent("a")
+    for i in range(10):
+        agent.actr_time = i / 10
+        trace(tracer, agent, f"e{i}")
+    assert len(tracer) == 11
+    assert tracer.records[0] == {"timestamp": 0.0, "type": "agent_added", "event": None, "agent_name": "a"}
+    assert events(tracer)[1:] == [f"e{i}" for i in range(10)]
+
+
+def test_ring_buffer_wraps_around():
+    tracer = BastiTracer(capacity=4)
+    agent = Agent("a")
+    for i in range(10):
+        agent.actr_time = float(i)
+        trace(tracer, agent, f"e{i}")
+
+    # 11 Einträge inklusive agent_added, die letzten 4 bleiben
+    assert tracer.count == 11
+    assert tracer.start == 7
+    assert len(tracer) == 4
+    assert events(tracer) == ["e6", "e7", "e8", "e9"]
+    assert [record["timestamp"] for record in tracer.records] == [6.0, 7.0, 8.0, 9.0]
+    assert tracer.record(7)["event"] == "e6"
+    assert tracer.record(10)["event"] == "e9"
+    assert [record["event"] for record in tracer.records_since(9)] == ["e8", "e9"]
+    assert [record["event"] for record in tracer.records_since(0)] == events(tracer)
+
+    with pytest.raises(IndexError):
+        tracer.record(6)
+    with pytest.raises(IndexError):
+        tracer.record(11)
+
+
+def test_agent_logs_drop_overwritten_entries():
+    tracer = BastiTracer(capacity=3)
+    a, b = Agent("a"), Agent("b")
+    trace(tracer, a, "a0")  # agent_added, a0
+    trace(tracer, b, "b0")  # agent_added, b0 -> verdrängt agent_added von a
+    trace(tracer, a, "a1")  # verdrängt a0
+    assert events(tracer) == [None, "b0", "a1"]
+    assert list(tracer.agent_log("a").indexes) == [4]
+    assert list(tracer.agent_log("b").indexes) == [2, 3]
+    assert tracer.agent_log("c") is None
+
+
+def test_overwritten_event_texts_are_released():
+    tracer = BastiTracer(capacity=5)
+    agent = Agent("a")
+    for i in range(1000):
+        trace(tracer, agent, f"e{i}" if i % 2 else "repeated")
+
+    held = {event for event in tracer.events if event is not None}
+    assert held == set(events(tracer)) - {None}
+    assert len(tracer.events) <= 8
+    assert tracer._event_index == {None: 0, **{event: tracer.events.index(event) for event in held}}
+
+
+def test_released_event_ids_are_reused():
+    tracer = BastiTracer(capacity=2)
+    agent = Agent("a")
+    trace(tracer, agent, "x")
+    trace(tracer, agent, "y")  # verdrängt agent_added
+    trace(tracer, agent, "z")  # verdrängt x, erst nach dem Internieren von z
+    assert tracer.events == [None, None, "y", "z"]
+    trace(tracer, agent, "w")  # bekommt die Id von x, verdrängt y
+    assert events(tracer) == ["z", "w"]
+    assert tracer.events == [None, "w", None, "z"]
+
+
+def test_overwritten_entries_are_spilled(tmp_path):
+    path = tmp_path / "spill.csv"
+    tracer = BastiTracer(capacity=2, spill_path=str(path))
+    agent = Agent("a")
+    for i in range(4):
+        agent.actr_time = float(i)
+        trace(tracer, agent, f"e{i}")
+    tracer.close()
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    # agent_added hat kein Event, csv schreibt None als leeres Feld
+    assert rows == [
+        ["0.0", "agent_added", "", "a"],
+        ["0.0", "PROCEDURAL", "e0", "a"],
+        ["1.0", "PROCEDURAL", "e1", "a"],
+    ]
+    assert events(tracer) == ["e2", "e3"]
@@ -0,0 +1,143 @@
+import contextlib
+import io
+import pickle
+import zlib
+
+import pytest
+from pyactr import chunks
+
+from simulation import EpisodeState
+from simulation.BastiTracer import BastiTracer
+from simulation.Simulation import Simulation
+
+AGENT_TYPE_CONFIG = {
+    "Imposter": {"count": 1, "pokedex_id": 647},
+    "Chatot": {"count": 1, "pokedex_id": 441},
+    "Hoothoot": {"count": 1},
+}
+
+
+def make_simulation(agent_type_config=AGENT_TYPE_CONFIG, steps=40):
+    simulation = Simulation(BastiTracer(), headless=True)
+    simulation.seed = 5
+    simulation.agent_type_config = agent_type_config
+    run(simulation, steps)
+    return simulation
+
+
+def run(simulation, steps):
+    """
+    Returns:
+        list: (Name, actr_time, Position, Goal, Retrieval) nach jedem kognitiven Schritt
+    """
+    trace = []
+    cognitive_step = simulation.cognitive_step
+
+    def step(agent):
+        cognitive_step(agent)
+        trace.append((
+            agent.name, round(agent.actr_time, 9), simulation.game_environment.find_agent(agent),
+            str(agent.actr_agent.goals), str(agent.actr_agent.retrievals)
+        ))
+
+    simulation.cognitive_step = step
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.run_headless(max_steps=steps)
+    del simulation.cognitive_step
+    return trace
+
+
+def restored_run(simulation, data, steps):
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.restore(data)
+    return run(simulation, steps)
+
+
+def test_restored_continuations_are_equal():
+    # restore startet jede pyactr Simulation neu, deshalb wird mit einer wiederhergestellten Fortsetzung verglichen
+    simulation = make_simulation()
+    data = simulation.snapshot()
+    continuation = restored_run(simulation, data, 60)
+    assert continuation
+
+    assert restored_run(simulation, data, 60) == continuation
+    assert restored_run(Simulation(BastiTracer(), headless=True), data, 60) == continuation
+
+
+def test_restore_builds_the_episode_in_a_fresh_simulation():
+    simulation = make_simulation()
+    data = simulation.snapshot()
+
+    fresh = Simulation(BastiTracer(), headless=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh.restore(data)
+    assert fresh.seed == simulation.seed
+    assert fresh.global_sim_time == simulation.global_sim_time
+    for agent, restored in zip(simulation.all_agents, fresh.all_agents):
+        assert restored.name == agent.name
+        assert restored.actr_time == agent.actr_time
+        assert fresh.game_environment.find_agent(restored) == simulation.game_environment.find_agent(agent)
+        assert str(restored.actr_agent.goals) == str(agent.actr_agent.goals)
+    assert [agent.name for agent in fresh.scheduler.ordered()] == [agent.name for agent in simulation.scheduler.ordered()]
+
+
+def test_restore_rejects_a_snapshot_of_other_agents():
+    data = make_simulation().snapshot()
+    other = make_simulation({"Imposter": {"count": 1, "pokedex_id": 647}, "Hoothoot": {"count": 2}})
+    actr_times = [agent.actr_time for agent in other.all_agents]
+
+    with pytest.raises(ValueError, match="different agents"):
+        other.restore(data)
+    # nichts wurde überschrieben
+    assert [agent.actr_time for agent in other.all_agents] == actr_times
+
+
+def test_restore_rejects_other_formats():
+    state = pickle.loads(zlib.decompress(make_simulation(steps=0).snapshot()))
+    state["format"] = EpisodeState.FORMAT_VERSION - 1
+    with pytest.raises(ValueError, match="Unsupported snapshot format"):
+        Simulation(BastiTracer(), headless=True).restore(zlib.compress(pickle.dumps(state)))
+
+
+def test_adapter_attributes_that_cannot_be_pickled_are_skipped():
+    class Unpicklable:
+        def __reduce__(self):
+            raise RuntimeError("not picklable")
+
+    simulation = make_simulation(steps=0)
+    simulation.all_agents[0].actr_adapter.unpicklable = Unpicklable()
+    data = simulation.snapshot()
+
+    fresh = Simulation(BastiTracer(), headless=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh.restore(data)
+    assert not hasattr(fresh.all_agents[0].actr_adapter, "unpicklable")
+
+
+def test_chunk_types_are_merged_into_the_registry():
+    registry = chunks.Chunk._chunktypes
+    chunks.chunktype("episode_test_kept", "a, b")
+    chunks.chunktype("episode_test_united", "a, b")
+    try:
+        EpisodeState._restore_chunk_types({
+            "episode_test_kept": (("a_",), ()),
+            "episode_test_united": (("a_", "c_"), ()),
+            "episode_test_grown": (("a_", "b_"), ()),
+            "episode_test_new": (("x_",), ()),
+        })
+        assert registry["episode_test_kept"]._fields == ("a_", "b_")
+        assert registry["episode_test_united"]._fields == ("a_", "b_", "c_")
+        assert registry["episode_test_new"]._fields == ("x_",)
+    finally:
+        for typename in ("episode_test_kept", "episode_test_united", "episode_test_grown", "episode_test_new"):
+            registry.pop(typename, None)
+
+
+def test_smaller_chunk_type_is_replaced_by_the_captured_one():
+    registry = chunks.Chunk._chunktypes
+    chunks.chunktype("episode_test_grown", "a")
+    try:
+        EpisodeState._restore_chunk_types({"episode_test_grown": (("a_", "b_"), ())})
+        assert registry["episode_test_grown"]._fields == ("a_", "b_")
+    finally:
+        registry.pop("episode_test_grown", None)
@@ -0,0 +1,100 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from simulation.Pathing import Pathing
+
+
+def bfs_next(start, goal, walkable):
+    # Die Breitensuche, die ImposterAdapter vor dem Pathing-Service für jeden Schritt gemacht hat
+    visited = {start}
+    queue = deque([(start, None)])
+    while queue:
+        (r, c), first = queue.popleft()
+        for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < len(walkable) and 0 <= nc < len(walkable[0])):
+                continue
+            if (nr, nc) in visited:
+                continue
+            if not walkable[nr][nc]:
+                continue
+            visited.add((nr, nc))
+            step = first or (nr, nc)
+            if (nr, nc) == goal:
+                return step
+            queue.append(((nr, nc), step))
+    return None
+
+
+def random_grid(rng, rows, cols, density):
+    return [[rng.random() >= density for _ in range(cols)] for _ in range(rows)]
+
+
+def test_next_step_matches_bfs_next():
+    rng = random.Random(11)
+    for _ in range(30):
+        rows, cols = rng.randint(1, 9), rng.randint(1, 9)
+        walkable = random_grid(rng, rows, cols, rng.choice((0.0, 0.2, 0.4)))
+        pathing = Pathing(walkable, max_fields=8)
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        for start in cells:
+            if not walkable[start[0]][start[1]]:
+                continue
+            for goal in cells:
+                assert pathing.next_step(start, goal) == bfs_next(start, goal, walkable), (walkable, start, goal)
+
+
+def test_next_step_is_none_at_goal_and_for_unreachable_goals():
+    walkable = [
+        [True, False, True],
+        [True, False, True],
+    ]
+    pathing = Pathing(walkable)
+    assert pathing.next_step((0, 0), (0, 0)) is None
+    assert pathing.next_step((0, 0), (0, 2)) is None
+    assert pathing.next_step((0, 0), (0, 1)) is None
+    assert pathing.distance((0, 0), (0, 2)) is None
+    assert pathing.next_step((0, 0), (1, 0)) == (1, 0)
+
+
+def test_ties_follow_the_direction_order():
+    pathing = Pathing(np.ones((3, 3), dtype=bool))
+    # nach oben vor rechts vor unten vor links
+    assert pathing.next_step((1, 1), (0, 2)) == (0, 1)
+    assert pathing.next_step((1, 1), (2, 2)) == (1, 2)
+    assert pathing.next_step((1, 1), (2, 0)) == (2, 1)
+    assert pathing.distance((1, 1), (2, 0)) == 2
+
+
+def test_distance_and_reachable():
+    walkable = [
+        [True, True, True],
+        [False, False, True],
+        [True, True, True],
+    ]
+    pathing = Pathing(walkable)
+    assert pathing.distance((0, 0), (2, 0)) == 6
+    assert pathing.distance((2, 0), (2, 0)) == 0
+    assert pathing.reachable((0, 0)).tolist() == [
+        [True, True, True],
+        [False, False, True],
+        [True, True, True],
+    ]
+
+
+def test_walkable_is_copied():
+    walkable = np.ones((1, 3), dtype=bool)
+    pathing = Pathing(walkable)
+    walkable[0, 1] = False
+    assert pathing.next_step((0, 0), (0, 2)) == (0, 1)
+
+
+def test_least_recently_used_field_is_evicted():
+    pathing = Pathing(np.ones((2, 2), dtype=bool), max_fields=2)
+    pathing.distance((0, 0), (0, 1))
+    pathing.distance((0, 0), (1, 0))
+    pathing.distance((0, 0), (0, 1))  # (0, 1) wieder benutzt
+    pathing.distance((0, 0), (1, 1))
+    assert list(pathing.fields) == [(0, 1), (1, 1)]
@@ -0,0 +1,91 @@
+import sys
+
+from pyactr_oo_syntax.base.rule_and_production import rule_, rule_sequence_, production_sequence
+from pyactr_oo_syntax.helpers.data_types import RuleType, Buffer
+
+
+def query(index):
+    return rule_(RuleType.QUERY, Buffer.GOAL, state=f"s{index}")
+
+
+def make_production(index):
+    return (query(index) >> query(index + 1000)).set_name(f"p{index}")
+
+
+def test_and_keeps_the_order_of_rules_and_sequences():
+    r = [query(i) for i in range(6)]
+    left = r[0] & r[1]
+    right = r[3] & r[4]
+    assert (left & r[2]).rules == (r[0], r[1], r[2])
+    assert (r[2] & left).rules == (r[2], r[0], r[1])
+    assert (left & right).rules == (r[0], r[1], r[3], r[4])
+    assert ((left & r[2]) & (right & r[5])).rules == tuple(r)
+    assert (rule_sequence_() & r[0]).rules == (r[0],)
+
+
+def test_joined_sequences_are_not_changed():
+    r = [query(i) for i in range(4)]
+    left = r[0] & r[1]
+    combined = left & (r[2] & r[3])
+    assert combined.rules == tuple(r)
+    assert left.rules == (r[0], r[1])
+    # beide Ergebnisse teilen sich left, bleiben aber unabhängig
+    assert (left & r[3]).rules == (r[0], r[1], r[3])
+    assert combined.rules == tuple(r)
+
+
+def test_production_and_extends_lhs_or_rhs():
+    r = [query(i) for i in range(4)]
+    p = r[0] >> r[1]
+    assert str(p & r[2]) == str(r[0] >> (r[1] & r[2]))
+    assert str(r[3] & p) == str((r[3] & r[0]) >> r[1])
+
+
+def test_add_keeps_the_order_of_productions():
+    p = [make_production(i) for i in range(5)]
+    pair = p[0] + p[1]
+    assert [item.get_name() for item in pair.productions] == ["p0", "p1"]
+
+    chain = pair + p[2] + (p[3] + p[4])
+    assert [item.get_name() for item in chain.productions] == ["p0", "p1", "p2", "p3", "p4"]
+    assert chain.productions[2] is p[2]
+
+    # production + production_sequence geht über __radd__
+    prefixed = p[4] + (p[0] + p[1])
+    assert [item.get_name() for item in prefixed.productions] == ["p4", "p0", "p1"]
+    assert prefixed.productions[0] is p[4]
+
+
+def test_add_copies_a_pair_of_productions():
+    a, b = make_production(0), make_production(1)
+    pair = a + b
+    assert pair.productions[0] is not a and pair.productions[1] is not b
+    assert str(pair) == f"{a}\n\n{b}"
+
+
+def test_other_operands_are_not_supported():
+    r = query(0)
+    p = make_production(0)
+    assert rule_sequence_((r,)).__and__(1) is NotImplemented
+    assert production_sequence((p,)).__add__("p") is NotImplemented
+    assert production_sequence((p,)).__radd__("p") is NotImplemented
+
+
+def test_long_chains_do_not_hit_the_recursion_limit():
+    count = sys.getrecursionlimit() * 3
+    r = [query(i % 10) for i in range(count)]
+    left_nested = rule_sequence_()
+    for item in r:
+        left_nested = left_nested & item
+    assert left_nested.rules == tuple(r)
+
+    right_nested = rule_sequence_()
+    for item in reversed(r):
+        right_nested = rule_sequence_((item,)) & right_nested
+    assert right_nested.rules == tuple(r)
+
+    p = [make_production(i % 10) for i in range(count)]
+    productions = production_sequence()
+    for item in p:
+        productions = productions + item
+    assert productions.productions == tuple(p)